@@ -0,0 +1,336 @@
+# app/bench.py
+# Per-stage timings for the parsing pipeline, used by `python main.py bench`.
+import io
+import re
+import time
+import tracemalloc
+from collections import defaultdict
+import pdfplumber
+
+from app.parser import _resume_sources, parse_resume_text
+from app.utils import (
+    nlp, PATTERNS, extract_text, extract_text_from_docx, iter_pdf_pages, extract_name, extract_name_with_source, extract_email, extract_phone,
+    has_github, has_linkedin, scan_contact_info,
+    EMAIL_PATTERN, PHONE_PATTERNS, GITHUB_PATTERN, LINKEDIN_PATTERN,
+    extract_experience_details, extract_education, extract_projects,
+    extract_section, extract_skills, compute_tfidf_match
+)
+
+
+def _stages(jd_text):
+    return [
+        ("name", extract_name),
+        ("email", extract_email),
+        ("phone", extract_phone),
+        ("github", has_github),
+        ("linkedin", has_linkedin),
+        ("experience", extract_experience_details),
+        ("education", extract_education),
+        ("projects", extract_projects),
+        ("achievements", lambda t: extract_section(t, ["ACHIEVEMENTS", "ACCOMPLISHMENTS", "AWARDS"])),
+        ("skills", extract_skills),
+        ("tfidf", lambda t: compute_tfidf_match(t, jd_text)),
+        ("parse_total", lambda t: parse_resume_text("bench", t, jd_text)),
+    ]
+
+
+def bench_parse(source, jd_text, repeat=1):
+    """Time every stage over every resume in `source`; returns rows sorted slowest first."""
+    totals = defaultdict(float)
+    calls = defaultdict(int)
+    texts = []
+    for filename, data in _resume_sources(source):
+        start = time.perf_counter()
+        text = extract_text(data, filename)
+        totals["extract_text"] += time.perf_counter() - start
+        calls["extract_text"] += 1
+        if text.strip():
+            texts.append(text)
+
+    for _ in range(repeat):
+        for text in texts:
+            for stage, fn in _stages(jd_text):
+                start = time.perf_counter()
+                fn(text)
+                totals[stage] += time.perf_counter() - start
+                calls[stage] += 1
+
+    rows = [{"stage": stage, "calls": calls[stage], "total_s": round(totals[stage], 4),
+             "per_call_ms": round(1000 * totals[stage] / calls[stage], 3)} for stage in totals]
+    return sorted(rows, key=lambda r: r["total_s"], reverse=True)
+
+
+def _resume_texts(source):
+    texts = []
+    for filename, data in _resume_sources(source):
+        text = extract_text(data, filename)
+        if text.strip():
+            texts.append(text)
+    return texts
+
+
+def _contact_legacy(text):
+    # The extractors as they were before the pattern registry: raw pattern
+    # strings per call, and a fresh lower() copy for each link check
+    match = re.search(EMAIL_PATTERN, text)
+    email = match.group(0) if match else ""
+    phone = ""
+    for pattern in PHONE_PATTERNS:
+        match = re.search(pattern, text)
+        if match:
+            phone = re.sub(r'[^\d+]', '', match.group(0))
+            break
+    return (email, phone, bool(re.search(GITHUB_PATTERN, text.lower())),
+            bool(re.search(LINKEDIN_PATTERN, text.lower())))
+
+
+def bench_contact(source, repeat=100):
+    """Legacy per-function contact extraction vs. compiled extractors vs. scan_contact_info."""
+    texts = _resume_texts(source)
+    compiled = lambda t: (extract_email(t), extract_phone(t), has_github(t), has_linkedin(t))
+    rows = []
+    for label, fn in (("legacy_per_function", _contact_legacy), ("compiled_per_function", compiled),
+                      ("scan_contact_info", scan_contact_info)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        calls = repeat * len(texts)
+        rows.append({"approach": label, "calls": calls, "total_s": round(elapsed, 4),
+                     "per_call_us": round(1e6 * elapsed / calls, 1) if calls else 0,
+                     "differs_from_legacy": sum(fn(t) != _contact_legacy(t) for t in texts)})
+    return rows
+
+
+def _name_full_document(text):
+    # extract_name as it was before the header window: the whole resume
+    # through every spaCy component, then the first-lines fallback
+    for ent in nlp(text).ents:
+        words = ent.text.split()
+        if ent.label_ == "PERSON" and 1 < len(words) <= 4 and not PATTERNS['digit'].search(ent.text):
+            return ent.text.strip()
+    for line in text.strip().split('\n')[:5]:
+        if line and not PATTERNS['name_line_reject'].search(line) and 1 < len(line.split()) <= 4:
+            return line.strip()
+    return ""
+
+
+def bench_name(source, repeat=1):
+    """Full-document NER vs. header-window NER, with how often each path found the name."""
+    texts = _resume_texts(source)
+    rows = []
+    for label, fn in (("full_document_ner", _name_full_document),
+                      ("header_window_ner", extract_name)):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for text in texts:
+                fn(text)
+        elapsed = time.perf_counter() - start
+        calls = repeat * len(texts)
+        rows.append({"approach": label, "calls": calls, "total_s": round(elapsed, 4),
+                     "per_call_ms": round(1000 * elapsed / calls, 3) if calls else 0,
+                     "differs_from_full": sum(fn(t) != _name_full_document(t) for t in texts)})
+    paths = defaultdict(int)
+    for text in texts:
+        paths[extract_name_with_source(text)[1]] += 1
+    rows.extend({"approach": f"path:{path}", "calls": count} for path, count in sorted(paths.items()))
+    return rows
+
+
+def _pdf_text_unreleased(path):
+    # The pre-streaming approach: every page's layout stays cached until the document closes
+    with pdfplumber.open(path) as pdf:
+        return "\n".join([page.extract_text(keep_empty_lines=False) or "" for page in pdf.pages])
+
+
+def _peak_kb(fn, *args):
+    tracemalloc.start()
+    try:
+        fn(*args)
+        return round(tracemalloc.get_traced_memory()[1] / 1024)
+    finally:
+        tracemalloc.stop()
+
+
+def bench_pdf_memory(source):
+    """Peak Python heap while extracting each PDF, streaming vs. keeping every page cached."""
+    rows = []
+    for filename, data in _resume_sources(source):
+        if not filename.lower().endswith(".pdf"):
+            continue
+        pages = sum(1 for _ in iter_pdf_pages(data))
+        rows.append({"file": filename, "pages": pages,
+                     "streaming_peak_kb": _peak_kb(lambda d: "\n".join(iter_pdf_pages(d)), data),
+                     "unreleased_peak_kb": _peak_kb(_pdf_text_unreleased, data)})
+    return rows
+
+
+def _docx_text_object_model(data):
+    # The python-docx approach: whole object model, body paragraphs only
+    import docx
+    return "\n".join(p.text for p in docx.Document(io.BytesIO(data)).paragraphs)
+
+
+def _synthetic_docx(paragraphs):
+    # A templated-looking resume: contact details in the header, skills in a table
+    import docx
+    doc = docx.Document()
+    doc.sections[0].header.paragraphs[0].text = "Jane Doe | jane.doe@example.com | +91 9876543210"
+    doc.add_paragraph("SKILLS")
+    table = doc.add_table(rows=20, cols=2)
+    for r, row in enumerate(table.rows):
+        row.cells[0].text, row.cells[1].text = f"Area {r}", "Python, SQL, Docker, AWS"
+    doc.add_paragraph("EXPERIENCE")
+    for i in range(paragraphs):
+        doc.add_paragraph(f"Software Engineer {i}: built data pipelines in Python and SQL, 2019 - 2023.")
+    out = io.BytesIO()
+    doc.save(out)
+    return out.getvalue()
+
+
+def bench_docx(source, repeat=5):
+    """
+    Streaming DOCX reader vs. python-docx: time, peak Python heap and characters
+    extracted, per file. Uses the .docx files in `source`, or a synthetic corpus
+    of growing size when there are none.
+    """
+    corpus = [(f, d if isinstance(d, bytes) else open(d, "rb").read())
+              for f, d in _resume_sources(source) if f.lower().endswith(".docx")]
+    if not corpus:
+        corpus = [(f"synthetic_{n}_paragraphs.docx", _synthetic_docx(n)) for n in (50, 500, 5000)]
+    rows = []
+    for filename, data in corpus:
+        for label, fn in (("python_docx", _docx_text_object_model), ("streaming", extract_text_from_docx)):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                text = fn(data)
+            rows.append({"file": filename, "reader": label, "kb": len(data) // 1024,
+                         "per_file_ms": round(1000 * (time.perf_counter() - start) / repeat, 2),
+                         "peak_kb": _peak_kb(fn, data), "chars": len(text)})
+    return rows
+
+
+def bench_email(count=50000, workers=1, transport="fake", spool_dir=None):
+    """Throughput of selecting, rendering and dispatching `count` synthetic candidate emails."""
+    from concurrent.futures import ProcessPoolExecutor
+    from app.emailer import make_transport
+    from app.engine import RenderStage, select_recipients
+    from app.templates import TemplateSet
+
+    statuses = ("Shortlisted", "Rejected", "To be Reviewed")
+    records = [{"Name": f"Candidate {i}", "Email": f"candidate{i}@example.com",
+                "Status": statuses[i % 3], "Final_Score": i % 100} for i in range(count)]
+    templates = TemplateSet()
+    rows = []
+
+    def timed(stage, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        n = len(result[0]) if stage == "select" else len(result)
+        rows.append({"stage": stage, "messages": n, "total_s": round(elapsed, 3),
+                     "msgs_per_s": round(n / elapsed) if elapsed else 0})
+        return result
+
+    recipients, _ = timed("select", select_recipients, records, templates)
+    render = RenderStage(templates, sender="bench@example.com")
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            messages = timed("render", render.run, recipients, pool)
+    else:
+        messages = timed("render", render.run, recipients)
+    timed(f"dispatch_{transport}", make_transport(transport, spool_dir=spool_dir).send_all, messages)
+    return rows
+
+
+def _synthetic_rows(count):
+    # Skill mixes drawn from the taxonomy, a few per candidate as real resumes have
+    import random
+    from app.utils import SOFT_SKILLS, TECH_SKILLS
+    rng = random.Random(7)
+    statuses = ("Shortlisted", "Rejected", "To be Reviewed")
+    return [{"Filename": f"resume_{i}.pdf", "Name": f"Candidate {i}", "Email": f"candidate{i}@example.com",
+             "Status": statuses[i % 3], "Final_Score": round(rng.uniform(20, 95), 2),
+             "YearsExperience": rng.randint(0, 12), "JD_Match_Score": round(rng.uniform(0, 40), 2),
+             "TechSkills": ", ".join(sorted(s.capitalize() for s in rng.sample(TECH_SKILLS, rng.randint(3, 12)))),
+             "SoftSkills": ", ".join(sorted(s.capitalize() for s in rng.sample(SOFT_SKILLS, rng.randint(1, 4))))}
+            for i in range(count)]
+
+
+def bench_skills(count=100000, skills=("Python", "Sql", "Docker")):
+    """
+    Memory and "has all of these skills" filter time over `count` synthetic
+    candidates: plain output rows (dicts with comma-joined skills) vs. the
+    compact CandidateTable.
+    """
+    from app.candidates import CandidateTable
+    from app.stats import _skills
+
+    wanted = {s.lower() for s in skills}
+    tracemalloc.start()
+    records = _synthetic_rows(count)
+    dict_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+    tracemalloc.start()
+    table = CandidateTable.from_records(records)
+    table_kb = tracemalloc.get_traced_memory()[0] / 1024
+    tracemalloc.stop()
+
+    def split_filter():
+        return [r for r in records
+                if wanted <= {s.lower() for s in _skills(r["TechSkills"]) + _skills(r["SoftSkills"])}]
+
+    rows = []
+    for label, kb, fn in (("dict_rows", dict_kb, split_filter),
+                          ("candidate_table", table_kb, lambda: table.select(all_skills=skills))):
+        start = time.perf_counter()
+        matches = len(fn())
+        rows.append({"representation": label, "candidates": count, "bytes_per_candidate": round(kb * 1024 / count),
+                     "filter_ms": round(1000 * (time.perf_counter() - start), 2), "matches": matches})
+    return rows
+
+
+def _work(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def bench_schedule(workers=4, count=40, seed=7):
+    """
+    Makespan of a skewed batch (a few 30-page portfolios among one-page
+    resumes) dispatched in folder order vs. largest first, with a simulated
+    cost of 10ms per page.
+    """
+    import random
+    from concurrent.futures import ProcessPoolExecutor
+    from app.engine import map_ordered
+
+    rng = random.Random(seed)
+    pages = [rng.choice((1, 1, 1, 2, 2, 3)) for _ in range(count)]
+    for i in rng.sample(range(count), max(1, count // 20)):
+        pages[i] = 30
+    pages.sort(key=lambda p: p == 30)  # worst case for folder order: the portfolios come last
+    seconds = [p * 0.01 for p in pages]
+    ideal = max(sum(seconds) / max(1, workers), max(seconds))
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        list(map_ordered(_work, [[0.0] * workers], pool))  # start the workers before timing
+        for label, costs in (("folder_order", None), ("largest_first", pages)):
+            start = time.perf_counter()
+            list(map_ordered(_work, [seconds], pool, costs))
+            elapsed = time.perf_counter() - start
+            rows.append({"order": label, "files": count, "workers": workers, "makespan_s": round(elapsed, 3),
+                         "ideal_s": round(ideal, 3), "overhead_pct": round(100 * (elapsed / ideal - 1), 1)})
+    return rows
+
+
+def print_table(rows):
+    if not rows:
+        print("Nothing to benchmark.")
+        return
+    cols = list(rows[0].keys())
+    widths = {c: max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in cols}
+    print("  ".join(c.ljust(widths[c]) for c in cols))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(widths[c]) for c in cols))
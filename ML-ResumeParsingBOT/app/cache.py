@@ -0,0 +1,35 @@
+# app/cache.py
+# On-disk cache of extracted resume text, keyed by a hash of the file contents,
+# so re-running a batch skips PDF/DOCX extraction for files already seen.
+import hashlib
+import os
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class TextCache:
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        # Two-level fan-out keeps directories small on big batches
+        return os.path.join(self.cache_dir, key[:2], key + ".txt")
+
+    def get(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, text):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename so parallel workers never read a partial entry
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
@@ -0,0 +1,191 @@
+# app/candidates.py
+# Compact in-memory candidates for large batches. An output row keeps every
+# skill as part of a comma-joined string, so every filter has to split it
+# again, and each row holds its own copy of the same skill names. Here:
+#
+#   - SkillVocab interns each skill name once as a small integer ID (the
+#     taxonomy in app.utils first, so those IDs are stable across batches)
+#   - Candidate is a __slots__ record holding skill ID tuples, not strings
+#   - CandidateTable packs every candidate's skills into a row of a numpy
+#     uint64 bitset matrix, so "has all of these skills" over 100k candidates
+#     is one vectorized AND + compare instead of 100k string splits
+import sys
+import numpy as np
+
+from app.utils import SOFT_SKILLS, TECH_SKILLS
+
+
+def _split(value):
+    if not isinstance(value, str):
+        return []
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
+class SkillVocab:
+    """Skill name <-> integer ID. Names are matched case-insensitively."""
+
+    def __init__(self, names=TECH_SKILLS + SOFT_SKILLS):
+        self.ids = {}
+        self.names = []  # ID -> display name (as first seen)
+        for name in names:
+            self.intern(name.capitalize())
+
+    def __len__(self):
+        return len(self.names)
+
+    def intern(self, name):
+        key = name.strip().lower()
+        skill_id = self.ids.get(key)
+        if skill_id is None:
+            skill_id = self.ids[key] = len(self.names)
+            self.names.append(sys.intern(name.strip()))
+        return skill_id
+
+    def lookup(self, names):
+        """IDs of `names`; None if any of them was never seen (so nobody can have it)."""
+        ids = []
+        for name in names:
+            skill_id = self.ids.get(name.strip().lower())
+            if skill_id is None:
+                return None
+            ids.append(skill_id)
+        return ids
+
+
+class Candidate:
+    """One scored candidate: the fields used for ranking and filtering, skills as vocab IDs."""
+
+    __slots__ = ("filename", "name", "email", "status", "score", "years", "jd_match", "tech", "soft")
+
+    def __init__(self, filename, name, email, status, score, years, jd_match, tech, soft):
+        self.filename = filename
+        self.name = name
+        self.email = email
+        self.status = status
+        self.score = score
+        self.years = years
+        self.jd_match = jd_match
+        self.tech = tech  # tuple of skill IDs
+        self.soft = soft
+
+    @classmethod
+    def from_record(cls, record, vocab):
+        def number(key):
+            try:
+                value = float(record.get(key) or 0)
+            except (TypeError, ValueError):
+                return 0.0
+            return 0.0 if value != value else value  # NaN from an empty CSV cell
+
+        def text(key):
+            value = record.get(key)
+            return value if isinstance(value, str) else ""
+
+        return cls(text("Filename"), text("Name"), text("Email"),
+                   sys.intern(text("Status")),  # a handful of distinct values shared by every row
+                   number("Final_Score"), number("YearsExperience"), number("JD_Match_Score"),
+                   tuple(vocab.intern(s) for s in _split(record.get("TechSkills"))),
+                   tuple(vocab.intern(s) for s in _split(record.get("SoftSkills"))))
+
+    def to_record(self, vocab):
+        return {"Filename": self.filename, "Name": self.name, "Email": self.email, "Status": self.status,
+                "Final_Score": self.score, "YearsExperience": self.years, "JD_Match_Score": self.jd_match,
+                "TechSkills": ", ".join(vocab.names[i] for i in self.tech),
+                "SoftSkills": ", ".join(vocab.names[i] for i in self.soft)}
+
+
+class CandidateTable:
+    """
+    Candidates plus parallel numpy columns (score, status code, skill bitsets)
+    for vectorized filtering. Rows are appended; arrays grow by doubling.
+    """
+
+    def __init__(self, vocab=None, capacity=1024):
+        self.vocab = vocab or SkillVocab()
+        self.candidates = []
+        self.statuses = []  # status code -> status
+        self._status_codes = {}
+        self.scores = np.zeros(capacity, dtype=np.float32)
+        self.status_codes = np.zeros(capacity, dtype=np.uint8)
+        self.bits = np.zeros((capacity, self._words(len(self.vocab))), dtype=np.uint64)
+
+    @staticmethod
+    def _words(n_skills):
+        return max(1, (n_skills + 63) // 64)
+
+    @classmethod
+    def from_records(cls, records, vocab=None):
+        records = list(records)
+        table = cls(vocab, capacity=max(1, len(records)))
+        for record in records:
+            table.add(record)
+        return table
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def _grow(self, rows, words):
+        capacity, width = self.bits.shape
+        if rows > capacity:
+            capacity = max(rows, capacity * 2)
+            self.scores = np.resize(self.scores, capacity)
+            self.status_codes = np.resize(self.status_codes, capacity)
+        if (capacity, max(width, words)) != self.bits.shape:
+            bits = np.zeros((capacity, max(width, words)), dtype=np.uint64)
+            bits[:len(self), :width] = self.bits[:len(self)]
+            self.bits = bits
+
+    def add(self, record):
+        candidate = Candidate.from_record(record, self.vocab)
+        row = len(self.candidates)
+        self._grow(row + 1, self._words(len(self.vocab)))
+        code = self._status_codes.get(candidate.status)
+        if code is None:
+            code = self._status_codes[candidate.status] = len(self.statuses)
+            self.statuses.append(candidate.status)
+        self.scores[row] = candidate.score
+        self.status_codes[row] = code
+        for skill_id in candidate.tech + candidate.soft:
+            self.bits[row, skill_id >> 6] |= np.uint64(1 << (skill_id & 63))
+        self.candidates.append(candidate)
+        return candidate
+
+    def mask(self, skill_ids):
+        """One bitset row with the bits of `skill_ids` set."""
+        mask = np.zeros(self.bits.shape[1], dtype=np.uint64)
+        for skill_id in skill_ids:
+            mask[skill_id >> 6] |= np.uint64(1 << (skill_id & 63))
+        return mask
+
+    def select(self, all_skills=(), any_skills=(), statuses=None, min_score=None, max_score=None):
+        """Row indices of candidates matching every given condition, best score first."""
+        n = len(self)
+        bits = self.bits[:n]
+        keep = np.ones(n, dtype=bool)
+        if all_skills:
+            ids = self.vocab.lookup(all_skills)
+            if ids is None:
+                return np.zeros(0, dtype=np.int64)
+            mask = self.mask(ids)
+            keep &= ((bits & mask) == mask).all(axis=1)
+        if any_skills:
+            ids = [i for i in (self.vocab.lookup([s]) for s in any_skills) if i is not None]
+            mask = self.mask(i[0] for i in ids)
+            keep &= (bits & mask).any(axis=1)
+        if statuses:
+            codes = [self._status_codes[s] for s in statuses if s in self._status_codes]
+            keep &= np.isin(self.status_codes[:n], codes)
+        if min_score is not None:
+            keep &= self.scores[:n] >= min_score
+        if max_score is not None:
+            keep &= self.scores[:n] <= max_score
+        rows = np.flatnonzero(keep)
+        return rows[np.argsort(-self.scores[rows], kind="stable")]
+
+    def filter(self, **conditions):
+        """Candidates from select(), as Candidate objects."""
+        return [self.candidates[i] for i in self.select(**conditions)]
+
+    def to_records(self, rows=None):
+        rows = range(len(self)) if rows is None else rows
+        return [self.candidates[i].to_record(self.vocab) for i in rows]
@@ -0,0 +1,432 @@
+# app/cli.py
+# Command line entry point: `python main.py <command> ...`. Every stage of the
+# pipeline can be driven from here (e.g. by cron) without Streamlit or Colab.
+import argparse
+import json
+import os
+import sys
+import time
+
+DEFAULT_JD = "JD.txt"
+DEFAULT_RESUMES = "resumes"
+DEFAULT_OUTPUT = "outputs/parsed_resumes.csv"
+
+
+# ==== COMMANDS ====
+
+def _scorer(profile):
+    from app.scoring import DEFAULT_SCORER, Scorer
+    return Scorer.from_file(profile) if profile else DEFAULT_SCORER
+
+
+def cmd_fetch(args):
+    from app.fetcher import fetch_resumes
+    saved = fetch_resumes(args.subject, args.resumes, host=args.host)
+    print(f"Fetched {len(saved)} new resumes into '{args.resumes}'.")
+
+
+def cmd_parse(args):
+    from app.engine import Engine
+    from app.output import RecordWriter, write_records
+    from app.stats import print_summary
+    from app.utils import load_jd_text
+
+    ocr = None
+    if args.ocr:
+        from app.ocr import OCRStage
+        ocr = OCRStage(workers=args.ocr_workers, cache_dir=args.cache_dir)
+    engine = Engine(load_jd_text(args.jd), workers=args.workers, cache_dir=args.cache_dir,
+                    dedupe=not args.no_dedupe, scorer=_scorer(args.profile), ocr=ocr,
+                    tier=args.tier, escalate=args.escalate)
+    start = time.perf_counter()
+    if args.stream:
+        # Rows are written as soon as each candidate is scored
+        with RecordWriter(args.output, args.format) as writer:
+            for record in engine.iter_records(args.resumes):
+                writer.write(record)
+            count = writer.count
+    else:
+        df = engine.run(args.resumes)
+        df = df.sort_values("Final_Score", ascending=False) if len(df) else df
+        write_records(df, args.output, args.format)
+        count = len(df)
+    print(f"✅ Parsed {count} candidates in {time.perf_counter() - start:.1f}s. Saved as '{args.output}'.")
+    # Kept next to the output so batches can be combined later with `stats`
+    engine.stats.save(args.output + ".stats.json")
+    print_summary(engine.stats.summary())
+
+
+def cmd_sweep(args):
+    from app.engine import FetchStage, NotifyStage
+    from app.pipeline import Pipeline
+    from app.stats import print_summary
+    from app.utils import load_jd_text
+
+    fetch = FetchStage(args.subject, args.resumes, host=args.host) if args.subject else None
+    notify = None
+    if not args.no_notify:
+        from app.emailer import make_transport
+        notify = NotifyStage(transport=make_transport(args.transport, connections=args.connections,
+                                                      spool_dir=args.spool_dir))
+    pipeline = Pipeline(load_jd_text(args.jd), fetch, notify, workers=args.workers, queue_size=args.queue_size,
+                        cache_dir=args.cache_dir, scorer=_scorer(args.profile))
+    pipeline.run(None if fetch else args.resumes, args.output)
+    pipeline.stats.save(args.output + ".stats.json")
+    print_summary(pipeline.stats.summary())
+
+
+def cmd_shard_split(args):
+    from app.shards import ShardQueue
+    from app.utils import load_jd_text
+    profile = None
+    if args.profile:
+        _scorer(args.profile)  # fail here, not on every worker
+        with open(args.profile, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+    count = ShardQueue(args.queue).split(args.resumes, load_jd_text(args.jd), args.shard_size, profile)
+    print(f"Split '{args.resumes}' into {count} shards in '{args.queue}'.")
+
+
+def cmd_shard_work(args):
+    from app.shards import work
+    completed = work(args.queue, workers=args.workers, cache_dir=args.cache_dir, wait=args.wait)
+    print(f"No shards left; this worker completed {completed}.")
+
+
+def cmd_shard_status(args):
+    from app.shards import ShardQueue
+    status = ShardQueue(args.queue).status()
+    print(f"{status['done']}/{status['shards']} shards done, {status['claimed']} in progress, "
+          f"{status['pending']} pending.")
+
+
+def cmd_shard_merge(args):
+    from app.shards import ShardQueue, merge
+    from app.stats import print_summary
+    status = ShardQueue(args.queue).status()
+    if status["done"] < status["shards"] and not args.partial:
+        print(f"Only {status['done']}/{status['shards']} shards are done; wait, or pass --partial.")
+        sys.exit(1)
+    df, stats, missing = merge(args.queue, args.output)
+    stats.save(args.output + ".stats.json")
+    for filename in missing:
+        print(f"No record for {filename} (unreadable, failed or shard not done)")
+    print(f"✅ Merged {len(df)} candidates from {status['done']} shards. Saved as '{args.output}'.")
+    print_summary(stats.summary())
+
+
+def cmd_score(args):
+    from app.parser import parse_resume_text, extract_resume_text
+    from app.utils import load_jd_text
+
+    text = extract_resume_text(os.path.basename(args.resume), args.resume, args.cache_dir)
+    record = parse_resume_text(os.path.basename(args.resume), text, load_jd_text(args.jd), _scorer(args.profile),
+                               args.tier)
+    if args.format == "json":
+        print(json.dumps(record, indent=2, default=str))
+    else:
+        for key in ("Name", "Email", "Phone", "YearsExperience", "TechSkills",
+                    "JD_Match_Score", "Final_Score", "Status"):
+            print(f"{key:>16}: {record[key]}")
+
+
+def cmd_shortlist(args):
+    from app.output import read_records, write_records
+
+    df = read_records(args.input)
+    if args.skills:
+        # Bitset match over the compact table instead of re-splitting every row's skill strings
+        from app.candidates import CandidateTable
+        rows = CandidateTable.from_records(df.to_dict("records")).select(all_skills=args.skills)
+        df = df.iloc[sorted(rows)]
+    if args.status:
+        df = df[df["Status"].isin(args.status)]
+    if args.min_score is not None:
+        df = df[df["Final_Score"] >= args.min_score]
+    df = df.sort_values("Final_Score", ascending=False)
+    if args.top:
+        df = df.head(args.top)
+    if args.output:
+        write_records(df, args.output, args.format)
+        print(f"Shortlisted {len(df)} candidates into '{args.output}'.")
+    else:
+        print(df[["Name", "Email", "Final_Score", "Status"]].to_string(index=False))
+
+
+def cmd_rescore(args):
+    import pandas as pd
+    from app.output import read_records, write_records
+    from app.stats import BatchStats, print_summary
+
+    scorer = _scorer(args.profile)
+    # Scores come from the fields already in the file; nothing is re-extracted or re-parsed
+    records = [scorer.rescore(r) for r in read_records(args.input).to_dict("records")]
+    records.sort(key=lambda r: r["Final_Score"], reverse=True)
+    output = args.output or args.input
+    write_records(pd.DataFrame(records), output, args.format)
+    stats = BatchStats.from_records(records)
+    stats.save(output + ".stats.json")
+    print(f"Re-scored {len(records)} candidates with profile '{scorer.name}'. Saved as '{output}'.")
+    print_summary(stats.summary())
+
+
+def cmd_stats(args):
+    from app.output import read_records
+    from app.stats import BatchStats, print_summary
+
+    total = BatchStats()
+    for path in args.inputs:
+        if path.endswith(".stats.json"):
+            total.merge(BatchStats.load(path))
+        else:
+            total.merge(BatchStats.from_records(read_records(path).to_dict("records")))
+    summary = total.summary(k=args.top, shortlist_pct=args.shortlist_pct, review_pct=args.review_pct)
+    if args.output:
+        total.save(args.output)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print_summary(summary)
+
+
+def cmd_email(args):
+    from app.emailer import make_transport, process_csv_and_send_emails
+    from app.templates import TemplateSet
+    fields = {"company": args.company, "role": args.role}
+    templates = (TemplateSet.from_folder(args.templates, args.jd_name, **fields) if args.templates
+                 else TemplateSet(**fields))
+    transport = make_transport(args.transport, connections=args.connections, spool_dir=args.spool_dir)
+    process_csv_and_send_emails(args.input, templates, transport=transport)
+
+
+def cmd_flush_spool(args):
+    from app.emailer import flush_spool, make_transport, print_result
+    results = flush_spool(args.spool_dir, make_transport("smtp", connections=args.connections),
+                          on_result=print_result)
+    sent = sum(1 for _, ok, _ in results if ok)
+    print(f"Flushed {sent} of {len(results)} spooled emails from '{args.spool_dir}'.")
+
+
+def cmd_bench(args):
+    from app import bench
+    from app.utils import load_jd_text
+    if args.suite == "pdf-memory":
+        bench.print_table(bench.bench_pdf_memory(args.resumes))
+    elif args.suite == "contact":
+        bench.print_table(bench.bench_contact(args.resumes, repeat=max(args.repeat, 100)))
+    elif args.suite == "email":
+        bench.print_table(bench.bench_email(args.count, workers=args.workers, transport=args.transport,
+                                            spool_dir=args.spool_dir))
+    elif args.suite == "docx":
+        bench.print_table(bench.bench_docx(args.resumes, repeat=max(args.repeat, 5)))
+    elif args.suite == "schedule":
+        bench.print_table(bench.bench_schedule(max(args.workers, 2)))
+    elif args.suite == "skills":
+        bench.print_table(bench.bench_skills(args.count))
+    elif args.suite == "name":
+        bench.print_table(bench.bench_name(args.resumes, repeat=args.repeat))
+    else:
+        bench.print_table(bench.bench_parse(args.resumes, load_jd_text(args.jd), repeat=args.repeat))
+
+
+def cmd_watch(args):
+    from app.watcher import ResumeWatcher
+    from app.utils import load_jd_text
+    watcher = ResumeWatcher(args.resumes, load_jd_text(args.jd), args.output, workers=args.workers,
+                            queue_size=args.queue_size, interval=args.interval, profile=args.profile)
+    watcher.run()
+
+
+def cmd_serve(args):
+    from app.server import run_server
+    run_server(args.host, args.port, args.workers, args.profile)
+
+
+# ==== ARGUMENTS ====
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="main.py", description="ResumeBot batch pipeline.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    def add_jd(p):
+        p.add_argument("--jd", default=DEFAULT_JD, help="Job description (TXT / PDF / DOCX)")
+
+    def add_resumes(p):
+        p.add_argument("--resumes", default=DEFAULT_RESUMES, help="Folder of PDF/DOCX resumes")
+
+    def add_workers(p, default=1):
+        p.add_argument("--workers", type=int, default=default, help="Parallel parser processes")
+
+    def add_profile(p, reloads=False):
+        p.add_argument("--profile", default=None,
+                       help="Scoring profile JSON (weights, tiers, thresholds)"
+                            + ("; edits are picked up while running" if reloads else ""))
+
+    def add_format(p, choices=("csv", "jsonl")):
+        p.add_argument("--format", choices=choices, default=None,
+                       help="Output format (default: from the file extension)")
+
+    def add_tier(p):
+        p.add_argument("--tier", choices=("fast", "balanced", "thorough"), default="thorough",
+                       help="fast: regex/keywords only (no spaCy); balanced: NER on the header only")
+
+    def add_transport(p, default="smtp"):
+        p.add_argument("--transport", choices=("smtp", "spool", "fake"), default=default,
+                       help="spool writes a Maildir for a later flush-spool; fake sends nothing")
+        p.add_argument("--spool-dir", default="outputs/email_spool")
+
+    p = sub.add_parser("fetch", help="Download resume attachments from the mailbox")
+    p.add_argument("--subject", required=True, help="Only mails whose subject contains this")
+    p.add_argument("--host", default="imap.gmail.com")
+    add_resumes(p)
+    p.set_defaults(func=cmd_fetch)
+
+    p = sub.add_parser("parse", help="Parse and score every resume in a folder")
+    add_jd(p)
+    add_resumes(p)
+    add_workers(p)
+    add_format(p)
+    p.add_argument("--output", default=DEFAULT_OUTPUT)
+    p.add_argument("--cache-dir", default=None, help="Reuse extracted text across runs")
+    p.add_argument("--stream", action="store_true", help="Write each row as soon as it is scored")
+    p.add_argument("--no-dedupe", action="store_true", help="Parse duplicate submissions too")
+    p.add_argument("--ocr", action="store_true", help="OCR PDF pages that have no text layer (needs tesseract)")
+    p.add_argument("--ocr-workers", type=int, default=1, help="Separate processes for OCR")
+    add_tier(p)
+    p.add_argument("--escalate", action="store_true",
+                   help="Re-parse 'To be Reviewed' candidates at the thorough tier")
+    add_profile(p)
+    p.set_defaults(func=cmd_parse)
+
+    p = sub.add_parser("sweep", help="Fetch, parse and email in one overlapped pass")
+    p.add_argument("--subject", default=None, help="Mailbox subject to sweep (default: just the --resumes folder)")
+    p.add_argument("--host", default="imap.gmail.com")
+    add_jd(p)
+    add_resumes(p)
+    add_workers(p, default=2)
+    p.add_argument("--output", default=DEFAULT_OUTPUT)
+    p.add_argument("--cache-dir", default=None)
+    p.add_argument("--queue-size", type=int, default=16, help="Items each stage may run ahead by")
+    p.add_argument("--connections", type=int, default=2, help="SMTP sessions to send over")
+    p.add_argument("--no-notify", action="store_true", help="Parse only, send no emails")
+    add_transport(p)
+    add_profile(p)
+    p.set_defaults(func=cmd_sweep)
+
+    def add_queue(p):
+        p.add_argument("--queue", required=True, help="Shared folder holding the sharded job")
+
+    p = sub.add_parser("shard-split", help="Split a resume folder into shards for several machines")
+    add_queue(p)
+    add_jd(p)
+    add_resumes(p)
+    p.add_argument("--shard-size", type=int, default=200, help="Resumes per shard")
+    add_profile(p)
+    p.set_defaults(func=cmd_shard_split)
+
+    p = sub.add_parser("shard-work", help="Claim and parse shards until none are left (run on every node)")
+    add_queue(p)
+    add_workers(p)
+    p.add_argument("--cache-dir", default=None)
+    p.add_argument("--wait", type=float, default=0.0,
+                   help="Seconds to wait for the job to appear and for other workers' shards")
+    p.set_defaults(func=cmd_shard_work)
+
+    p = sub.add_parser("shard-status", help="Progress of a sharded job")
+    add_queue(p)
+    p.set_defaults(func=cmd_shard_status)
+
+    p = sub.add_parser("shard-merge", help="Combine finished shards into the final ranked report")
+    add_queue(p)
+    p.add_argument("--output", default=DEFAULT_OUTPUT)
+    p.add_argument("--partial", action="store_true", help="Merge even if some shards are not done")
+    p.set_defaults(func=cmd_shard_merge)
+
+    p = sub.add_parser("score", help="Score one resume against the JD")
+    p.add_argument("resume")
+    add_jd(p)
+    p.add_argument("--cache-dir", default=None)
+    p.add_argument("--format", choices=("text", "json"), default="text")
+    add_tier(p)
+    add_profile(p)
+    p.set_defaults(func=cmd_score)
+
+    p = sub.add_parser("rescore", help="Re-score a parsed output file under another profile")
+    p.add_argument("--input", default=DEFAULT_OUTPUT)
+    p.add_argument("--output", default=None, help="Default: overwrite the input")
+    add_profile(p)
+    add_format(p)
+    p.set_defaults(func=cmd_rescore)
+
+    p = sub.add_parser("shortlist", help="Filter and rank a parsed output file")
+    p.add_argument("--input", default=DEFAULT_OUTPUT)
+    p.add_argument("--output", default=None, help="Write here instead of printing")
+    p.add_argument("--status", nargs="*", default=["Shortlisted"])
+    p.add_argument("--min-score", type=float, default=None)
+    p.add_argument("--top", type=int, default=None)
+    p.add_argument("--skills", nargs="*", default=None, help="Only candidates with all of these skills")
+    add_format(p)
+    p.set_defaults(func=cmd_shortlist)
+
+    p = sub.add_parser("stats", help="Score distribution, skills and suggested thresholds")
+    p.add_argument("inputs", nargs="+", help="<output>.stats.json files and/or parsed CSV/JSONL files")
+    p.add_argument("--output", default=None, help="Save the merged stats here")
+    p.add_argument("--top", type=int, default=10, help="How many skills to list")
+    p.add_argument("--shortlist-pct", type=float, default=0.2, help="Share of candidates to shortlist")
+    p.add_argument("--review-pct", type=float, default=0.5, help="Share shortlisted or reviewed")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("email", help="Email shortlisted and rejected candidates")
+    p.add_argument("--input", default=DEFAULT_OUTPUT)
+    p.add_argument("--templates", default=None, help="Folder of <status>.txt templates (default: built-in)")
+    p.add_argument("--jd-name", default=None, help="Use the overrides in <templates>/<jd-name>/")
+    p.add_argument("--role", default="the role")
+    p.add_argument("--company", default="Accenture")
+    p.add_argument("--connections", type=int, default=2, help="SMTP sessions to send over")
+    add_transport(p)
+    p.set_defaults(func=cmd_email)
+
+    p = sub.add_parser("flush-spool", help="Send every email waiting in a spool folder over SMTP")
+    p.add_argument("--spool-dir", required=True)
+    p.add_argument("--connections", type=int, default=2)
+    p.set_defaults(func=cmd_flush_spool)
+
+    p = sub.add_parser("bench", help="Time each parsing stage over a folder")
+    add_jd(p)
+    add_resumes(p)
+    p.add_argument("--repeat", type=int, default=1)
+    p.add_argument("--suite", default="stages",
+                   choices=("stages", "pdf-memory", "contact", "name", "email", "docx", "skills", "schedule"))
+    p.add_argument("--count", type=int, default=50000, help="Synthetic candidates for the email / skills suites")
+    add_workers(p)
+    add_transport(p, default="fake")
+    p.set_defaults(func=cmd_bench)
+
+    p = sub.add_parser("watch", help="Keep parsing resumes as they arrive in a folder")
+    add_jd(p)
+    add_resumes(p)
+    add_workers(p, default=2)
+    p.add_argument("--output", default=DEFAULT_OUTPUT)
+    p.add_argument("--queue-size", type=int, default=100)
+    p.add_argument("--interval", type=float, default=2.0, help="Seconds between folder polls")
+    add_profile(p, reloads=True)
+    p.set_defaults(func=cmd_watch)
+
+    p = sub.add_parser("serve", help="Run the local HTTP scoring API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    add_workers(p, default=2)
+    add_profile(p, reloads=True)
+    p.set_defaults(func=cmd_serve)
+
+    return ap
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
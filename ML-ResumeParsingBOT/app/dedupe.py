@@ -0,0 +1,122 @@
+# app/dedupe.py
+# Near-duplicate resume detection: shingled MinHash signatures + LSH banding,
+# plus exact grouping on the extracted email / phone number.
+import re
+import zlib
+import numpy as np
+
+# ==== MINHASH SETUP ====
+
+NUM_PERM = 120          # signature length (BANDS * ROWS)
+BANDS = 20
+ROWS = 6                # LSH threshold ~ (1/BANDS) ** (1/ROWS) ~= 0.61
+SHINGLE_SIZE = 3        # words per shingle
+THRESHOLD = 0.6         # estimated Jaccard needed to call two resumes duplicates
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed so signatures are comparable across runs/batches.
+# a, b < 2**32 and shingle hashes < 2**32 keep a*x + b inside uint64.
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """Hashes of the word k-shingles of a resume (lower-cased, punctuation stripped)."""
+    words = _TOKEN_RE.findall(text.lower())
+    if len(words) < k:
+        words = words + [''] * (k - len(words))
+    shingles = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+    return np.fromiter((zlib.crc32(s.encode('utf-8')) for s in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+def minhash_signature(text):
+    hashes = shingle_hashes(text)
+    # (NUM_PERM x shingles) permuted hashes, min over shingles
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1)
+
+
+def estimate_jaccard(sig_a, sig_b):
+    return float(np.count_nonzero(sig_a == sig_b)) / NUM_PERM
+
+
+# ==== CONTACT KEYS ====
+
+def contact_keys(email, phone):
+    """Normalized keys used to group resumes from the same candidate."""
+    keys = []
+    if email:
+        keys.append('email:' + email.strip().lower())
+    digits = re.sub(r'\D', '', phone or '')
+    if len(digits) >= 10:
+        keys.append('phone:' + digits[-10:])  # drop country code
+    return keys
+
+
+# ==== GROUPING ====
+
+class _UnionFind:
+    def __init__(self, n):
+        self.parent = list(range(n))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def find_duplicate_groups(texts, contacts=None, threshold=THRESHOLD):
+    """
+    Group near-duplicate resumes in one pass over the batch.
+
+    Args:
+        texts: list of resume texts
+        contacts: optional list of key lists (see contact_keys), one per text
+        threshold: minimum estimated Jaccard similarity for a text match
+
+    Returns:
+        List of groups, each a sorted list of indices into `texts`.
+        Unique resumes come back as single-element groups.
+    """
+    n = len(texts)
+    uf = _UnionFind(n)
+    signatures = [minhash_signature(t) for t in texts]
+
+    # LSH banding: resumes sharing any band bucket become candidate pairs,
+    # which are then confirmed against the full signature.
+    for band in range(BANDS):
+        buckets = {}
+        start = band * ROWS
+        for i, sig in enumerate(signatures):
+            key = sig[start:start + ROWS].tobytes()
+            j = buckets.setdefault(key, i)
+            if j != i and uf.find(i) != uf.find(j) and \
+               estimate_jaccard(signatures[i], signatures[j]) >= threshold:
+                uf.union(i, j)
+
+    # Same email or phone number means same candidate, whatever the text says
+    if contacts:
+        seen = {}
+        for i, keys in enumerate(contacts):
+            for key in keys:
+                if key in seen:
+                    uf.union(i, seen[key])
+                else:
+                    seen[key] = i
+
+    groups = {}
+    for i in range(n):
+        groups.setdefault(uf.find(i), []).append(i)
+    return sorted(groups.values())
@@ -1,73 +1,234 @@
 # app/emailer.py (Revised)
+import mailbox
 import smtplib
 import os
-import pandas as pd # Import pandas here
-from email.mime.text import MIMEText
+import threading
+import time
+from app.output import read_records
+from app.templates import TemplateSet, render_message
 from dotenv import load_dotenv
 
 load_dotenv()
 SENDER_EMAIL = os.getenv("EMAIL")
 SENDER_PASSWORD = os.getenv("APP_PASSWORD")
 
-def send_email(to_email, name, status):
-    # ... (Your existing send_email function code) ...
-    if status == "Shortlisted":
-        subject = "You’ve Been Shortlisted"
-        body = f"Dear {name},\n\nYou are shortlisted for the role.\n\n- Accenture"
-    elif status == "Rejected":
-        subject = "Application Update"
-        body = f"Dear {name},\n\nWe won’t be proceeding further.\n\n- Accenture"
-    else:
-        return False
 
-    msg = MIMEText(body)
-    msg['Subject'] = subject
-    msg['From'] = SENDER_EMAIL
-    msg['To'] = to_email
+# ==== TRANSPORTS ====
+# Everything that sends takes a transport: an object with
+# send_all(messages, on_result=None, cancel=None) -> [(to, ok, error)].
+# on_result(to, ok, error) is called as each message finishes and `cancel` is
+# an optional threading.Event that stops the batch early.
 
-    try:
-        server = smtplib.SMTP('smtp.gmail.com', 587)
+class SMTPTransport:
+    """
+    Sends pre-built messages over `connections` SMTP sessions kept open for the
+    whole batch, instead of a connect + TLS + login per email.
+    """
+
+    def __init__(self, host="smtp.gmail.com", port=587, user=None, password=None, connections=2, delay=0.0):
+        self.host = host
+        self.port = port
+        self.user = user or SENDER_EMAIL
+        self.password = password or SENDER_PASSWORD
+        self.connections = max(1, connections)
+        self.delay = delay  # seconds between emails on each connection, for provider rate limits
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port)
         server.starttls()
-        server.login(SENDER_EMAIL, SENDER_PASSWORD)
-        server.send_message(msg)
-        server.quit()
-        print(f"Sent to {to_email}")
-        return True
-    except Exception as e:
-        print(f"Failed: {to_email} — {e}")
+        server.login(self.user, self.password)
+        return server
+
+    def _send(self, server, msg):
+        # A session the server dropped mid-batch is reopened once
+        try:
+            server.send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            server = self._connect()
+            server.send_message(msg)
+        return server
+
+    def _connection_worker(self, next_message, on_result, cancel):
+        server = None
+        while cancel is None or not cancel.is_set():
+            msg = next_message()
+            if msg is None:
+                break
+            try:
+                server = server or self._connect()
+                server = self._send(server, msg)
+                on_result(msg['To'], True, None)
+            except Exception as e:
+                server = None
+                on_result(msg['To'], False, e)
+            if self.delay:
+                time.sleep(self.delay)
+        if server is not None:
+            try:
+                server.quit()
+            except Exception:
+                pass
+
+    def send_all(self, messages, on_result=None, cancel=None):
+        """
+        Send every message; returns [(to, ok, error)] in completion order.
+        `messages` may be a generator (e.g. fed by a pipeline queue); the
+        connections pull from it as they go, and only open when there is mail.
+        """
+        messages = iter(messages)
+        results = []
+        lock = threading.Lock()
+        pull_lock = threading.Lock()  # separate, so a slow generator never blocks result reporting
+
+        def next_message():
+            with pull_lock:
+                return next(messages, None)
+
+        def record(to, ok, error):
+            with lock:
+                results.append((to, ok, error))
+                if on_result is not None:
+                    on_result(to, ok, error)
+
+        threads = [threading.Thread(target=self._connection_worker, args=(next_message, record, cancel), daemon=True)
+                   for _ in range(self.connections)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+
+class SpoolTransport:
+    """
+    Writes each message into a local Maildir instead of sending it, for dry runs
+    and load tests; flush_spool() later pushes the spool through a real transport.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.maildir = mailbox.Maildir(folder, create=True)
+
+    def send_all(self, messages, on_result=None, cancel=None):
+        results = []
+        for msg in messages:
+            if cancel is not None and cancel.is_set():
+                break
+            try:
+                self.maildir.add(msg)  # written to tmp/ then renamed into new/
+                result = (msg['To'], True, None)
+            except Exception as e:
+                result = (msg['To'], False, e)
+            results.append(result)
+            if on_result is not None:
+                on_result(*result)
+        return results
+
+
+class FakeTransport:
+    """
+    In-process transport that accepts everything. It serializes each message as
+    SMTP would, so timings include that cost; `keep` holds on to the messages
+    so a test can check what would have been sent.
+    """
+
+    def __init__(self, keep=True, fail=()):
+        self.keep = keep
+        self.fail = {a.lower() for a in fail}  # addresses to report as failed
+        self.sent = []
+        self.bytes_sent = 0
+
+    def send_all(self, messages, on_result=None, cancel=None):
+        results = []
+        for msg in messages:
+            if cancel is not None and cancel.is_set():
+                break
+            if str(msg['To']).lower() in self.fail:
+                result = (msg['To'], False, smtplib.SMTPRecipientsRefused({msg['To']: (550, b"fake")}))
+            else:
+                self.bytes_sent += len(msg.as_bytes())
+                if self.keep:
+                    self.sent.append(msg)
+                result = (msg['To'], True, None)
+            results.append(result)
+            if on_result is not None:
+                on_result(*result)
+        return results
+
+
+TRANSPORTS = ("smtp", "spool", "fake")
+
+
+def make_transport(kind="smtp", connections=2, delay=0.0, spool_dir=None):
+    if kind == "smtp":
+        return SMTPTransport(connections=connections, delay=delay)
+    if kind == "spool":
+        if not spool_dir:
+            raise ValueError("The spool transport needs a spool folder")
+        return SpoolTransport(spool_dir)
+    if kind == "fake":
+        return FakeTransport()
+    raise ValueError(f"Unknown email transport '{kind}' (choose from {', '.join(TRANSPORTS)})")
+
+
+def flush_spool(folder, transport, on_result=None):
+    """
+    Send everything waiting in a spool folder through `transport` in one batch.
+    Messages that went out are removed; failures stay for the next flush.
+    """
+    spool = mailbox.Maildir(folder, create=False)
+    waiting = {}  # address -> [(key, message)], oldest first
+    for key in sorted(spool.keys()):  # Maildir keys start with the delivery time
+        msg = spool[key]
+        waiting.setdefault(msg['To'], []).append((key, msg))
+    results = []
+    # Results only name the address, so each batch holds at most one message per
+    # address; that way a result always maps back to the spooled entry it was for
+    while waiting:
+        batch = {to: queued.pop(0) for to, queued in waiting.items()}
+        waiting = {to: queued for to, queued in waiting.items() if queued}
+        sent = transport.send_all([msg for _, msg in batch.values()], on_result=on_result)
+        for to, ok, _ in sent:
+            if ok and to in batch:
+                spool.remove(batch[to][0])
+        results.extend(sent)
+    return results
+
+
+def print_result(to, ok, error):
+    if ok:
+        print(f"Sent to {to}")
+    else:
+        print(f"Failed: {to} — {error}")
+
+
+def send_email(to_email, name, status, templates=None):
+    """Send one email; batches should go through NotifyStage to reuse connections."""
+    msg = render_message(templates or TemplateSet(), {"email": to_email, "name": name, "status": status},
+                         SENDER_EMAIL)
+    if msg is None:
         return False
+    return SMTPTransport(connections=1).send_all([msg], on_result=print_result)[0][1]
 
 
-def process_csv_and_send_emails(csv_file_path):
+def process_csv_and_send_emails(csv_file_path, templates=None, connections=2, transport=None):
     """
     Reads a CSV file containing parsed resume data and sends emails
-    to candidates based on their status.
+    to candidates based on their status, over SMTP unless another
+    transport (see make_transport) is given.
     """
     if not os.path.exists(csv_file_path):
         print(f"Error: CSV file not found at {csv_file_path}")
         return
 
     try:
-        df = pd.read_csv(csv_file_path)
+        df = read_records(csv_file_path) # CSV or JSON Lines
     except Exception as e:
         print(f"Error reading CSV file: {e}")
         return
 
-    sent_count = 0
     if "Email" in df.columns and "Name" in df.columns and "Status" in df.columns:
-        for index, row in df.iterrows():
-            name = row.get("Name", "Candidate")
-            email = row.get("Email", "")
-            status = str(row.get("Status", "")).strip()
-
-            if status in ["Shortlisted", "Rejected"] and email:
-                if send_email(email, name, status):
-                    sent_count += 1
-                else:
-                    print(f"Skipped email for {name} ({email}) due to an error or invalid status.")
-            else:
-                print(f"Skipped email for row {index}: Missing email, name, or status is not 'Shortlisted' or 'Rejected'.")
-        print(f"\nCompleted: Sent emails to {sent_count} candidates.")
+        from app.engine import NotifyStage
+        NotifyStage(templates, connections=connections, transport=transport).run(df.to_dict("records"))
     else:
         print("Error: 'Email', 'Name', or 'Status' columns not found in the CSV.")
-
@@ -0,0 +1,338 @@
+# app/engine.py
+# The resume pipeline as explicit stages: fetch -> extract -> score -> notify
+# (notify = render every message, then send them over pooled connections).
+# The CLI, the Streamlit jobs and the Colab notebook all run through these, so
+# caching, pooling and parallelism only have to be implemented here once.
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import pandas as pd
+
+from app.parser import (DEFAULT_TIER, ESCALATE_STATUS, _resume_sources, extract_resume_pages, group_duplicates,
+                        parse_resume_text)
+from app.schedule import estimate_cost, largest_first, text_cost
+from app.stats import BatchStats
+from app.templates import TemplateSet, candidate_fields, render_messages
+
+
+class StageHooks:
+    """
+    What a stage reports to. The default prints messages and hands a stage's
+    whole batch to the pool at once, as the CLI always has. The Streamlit jobs
+    override message / stage / advance to show progress, set `window` to keep
+    only a few tasks queued on their shared pool, and set `cancel` (a
+    threading.Event) to stop a stage early.
+    """
+
+    def __init__(self, cancel=None, window=None):
+        self.cancel = cancel
+        self.window = window
+
+    @property
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def message(self, level, text):
+        print(text)
+
+    def stage(self, name, total):
+        """A new step starts with `total` tasks."""
+
+    def advance(self):
+        """One task of the current step finished."""
+
+
+def map_ordered(fn, arg_lists, pool=None, costs=None, hooks=None):
+    """
+    Yield (result, error) for fn(*args) in input order, on `pool` if one is given.
+    With `costs` (one estimate per task), tasks are submitted most expensive
+    first so a big file never starts last; results still come back in input order.
+    Stops early, dropping queued tasks, once `hooks` is cancelled.
+    """
+    hooks = hooks or StageHooks()
+    if pool is None:
+        for args in zip(*arg_lists):
+            if hooks.cancelled:
+                return
+            try:
+                yield fn(*args), None
+            except Exception as e:
+                yield None, e
+            finally:
+                hooks.advance()
+        return
+    tasks = list(zip(*arg_lists))
+    order = iter(largest_first(costs) if costs is not None else range(len(tasks)))
+    window = hooks.window or len(tasks)
+    futures, running = {}, set()
+    try:
+        for i in range(len(tasks)):
+            while True:
+                running = {f for f in running if not f.done()}
+                while len(running) < window:
+                    j = next(order, None)
+                    if j is None:
+                        break
+                    futures[j] = pool.submit(fn, *tasks[j])
+                    futures[j].add_done_callback(lambda f: f.cancelled() or hooks.advance())
+                    running.add(futures[j])
+                if hooks.cancelled:
+                    return
+                if i in futures and futures[i].done():
+                    break
+                wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            try:
+                yield futures.pop(i).result(), None
+            except Exception as e:
+                yield None, e
+    finally:
+        for future in futures.values():
+            future.cancel()
+
+
+class ExtractedBatch:
+    """Texts of one batch, plus which copy of each candidate should be scored."""
+
+    def __init__(self, filenames, texts, groups):
+        self.filenames = filenames
+        self.texts = texts
+        self.groups = groups  # [(index to score, [duplicate filenames])]
+
+
+# ==== STAGES ====
+
+class FetchStage:
+    """Download resume attachments from the mailbox into `folder`."""
+
+    def __init__(self, subject, folder, host="imap.gmail.com", user=None, password=None):
+        self.subject = subject
+        self.folder = folder
+        self.imap_options = {"host": host, "user": user, "password": password}
+
+    def run(self):
+        from app.fetcher import fetch_resumes
+        fetch_resumes(self.subject, self.folder, **self.imap_options)
+        return self.folder
+
+
+class ExtractStage:
+    """
+    Pull text out of every PDF/DOCX (cached by content hash) and group duplicates.
+    With an `ocr` stage, PDFs that have pages without a text layer are sent to it.
+    """
+
+    def __init__(self, cache_dir=None, dedupe=True, ocr=None):
+        self.cache_dir = cache_dir
+        self.dedupe = dedupe
+        self.ocr = ocr  # app.ocr.OCRStage or None
+
+    def run(self, source, pool=None, hooks=None):
+        """ExtractedBatch of `source`; empty if `hooks` is cancelled part way."""
+        hooks = hooks or StageHooks()
+        sources = _resume_sources(source)
+        names = [f for f, _ in sources]
+        costs = [estimate_cost(f, d) for f, d in sources] if pool is not None else None
+        hooks.stage("extracting", len(sources))
+        extracted = map_ordered(extract_resume_pages,
+                                [names, [d for _, d in sources], [self.cache_dir] * len(sources)], pool, costs,
+                                hooks)
+        texts_by_index, scans = {}, []
+        for i, (filename, (result, error)) in enumerate(zip(names, extracted)):
+            if error is not None:
+                hooks.message("error", f"Error extracting text from {filename}: {error}")
+                continue
+            text, blank_pages = result
+            if blank_pages and self.ocr is not None:
+                scans.append((i, filename, sources[i][1]))
+            texts_by_index[i] = text
+        if hooks.cancelled:
+            return ExtractedBatch([], [], [])
+
+        if scans:
+            hooks.message("info", f"Running OCR on {len(scans)} scanned resumes...")
+            hooks.stage("scanning", len(scans))
+            for i, text, error in self.ocr.run(scans):
+                if error is not None:
+                    hooks.message("error", f"OCR failed for {names[i]}: {error}")
+                else:
+                    texts_by_index[i] = text
+                hooks.advance()
+                if hooks.cancelled:
+                    return ExtractedBatch([], [], [])
+
+        filenames, texts = [], []
+        for i in sorted(texts_by_index):
+            if not texts_by_index[i].strip(): # Skip empty resumes
+                hooks.message("warning", f"Skipping empty or unreadable resume: {names[i]}")
+                continue
+            filenames.append(names[i])
+            texts.append(texts_by_index[i])
+        return ExtractedBatch(filenames, texts, group_duplicates(filenames, texts, self.dedupe))
+
+
+class ScoreStage:
+    """
+    Parse fields and score each candidate against the JD at a pipeline tier;
+    yields records as they finish. With `escalate`, candidates a cheaper tier
+    leaves "To be Reviewed" are parsed again at the thorough tier, after the rest.
+    """
+
+    def __init__(self, jd_text, scorer=None, tier=DEFAULT_TIER, escalate=False):
+        self.jd_text = jd_text
+        self.scorer = scorer  # app.scoring.Scorer; None is the default profile
+        self.tier = tier
+        self.escalate = escalate and tier != "thorough"
+
+    def _parse(self, batch, groups, tier, pool, hooks):
+        keep = [k for k, _ in groups]
+        parsed = map_ordered(parse_resume_text, [[batch.filenames[k] for k in keep],
+                                                 [batch.texts[k] for k in keep],
+                                                 [self.jd_text] * len(keep),
+                                                 [self.scorer] * len(keep),
+                                                 [tier] * len(keep)], pool,
+                             [text_cost(batch.texts[k]) for k in keep], hooks)
+        for (k, duplicates), (record, error) in zip(groups, parsed):
+            if error is not None:
+                hooks.message("error", f"Error parsing {batch.filenames[k]}: {error}")
+                continue
+            record['DuplicateFiles'] = ', '.join(duplicates)
+            yield (k, duplicates), record
+
+    def run(self, batch, pool=None, hooks=None):
+        hooks = hooks or StageHooks()
+        borderline = []
+        hooks.stage("parsing", len(batch.groups))
+        for group, record in self._parse(batch, batch.groups, self.tier, pool, hooks):
+            if self.escalate and record['Status'] == ESCALATE_STATUS:
+                borderline.append((group, record))
+            else:
+                yield record
+        if borderline and not hooks.cancelled:
+            hooks.message("info", f"Escalating {len(borderline)} borderline candidates to the thorough tier...")
+            hooks.stage("escalating", len(borderline))
+            escalated = set()
+            for (k, _), record in self._parse(batch, [g for g, _ in borderline], "thorough", pool, hooks):
+                escalated.add(k)
+                yield record
+            borderline = [(g, r) for g, r in borderline if g[0] not in escalated]
+        for _, record in borderline:  # not re-parsed (cancelled or failed): keep the cheaper tier's result
+            yield record
+
+
+def select_recipients(records, templates, emailed=None):
+    """
+    Candidate fields for everyone who should get an email, and notes on the rows
+    skipped. Pass the same `emailed` set to calls over one stream of records.
+    """
+    recipients, skipped = [], []
+    emailed = set() if emailed is None else emailed # A candidate who applied more than once only gets one email
+    for index, row in enumerate(records):
+        fields = candidate_fields(row)
+        email, status = fields["email"], fields["status"]
+        if not email or email.lower() == "nan":
+            skipped.append(f"Skipped email for row {index}: No valid email address.")
+        elif email.lower() in emailed:
+            skipped.append(f"Skipped email for row {index}: {email} was already emailed.")
+        elif not templates.handles(status):
+            skipped.append(f"Skipped email for row {index}: No email template for status '{status}'.")
+        else:
+            emailed.add(email.lower())
+            recipients.append(fields)
+    return recipients, skipped
+
+
+class RenderStage:
+    """Build every outgoing message of a batch up front from the compiled templates."""
+
+    chunk_size = 500  # candidates per pool task; one task per message costs more in IPC than rendering
+
+    def __init__(self, templates=None, sender=None):
+        self.templates = templates or TemplateSet()
+        self.sender = sender
+
+    def run(self, recipients, pool=None):
+        if self.sender is None:
+            from app.emailer import SENDER_EMAIL as sender
+        else:
+            sender = self.sender
+        chunks = [recipients[i:i + self.chunk_size] for i in range(0, len(recipients), self.chunk_size)]
+        n = len(chunks)
+        rendered = map_ordered(render_messages, [[self.templates] * n, chunks, [sender] * n], pool)
+        messages = []
+        for chunk, (batch, error) in zip(chunks, rendered):
+            if error is not None:
+                print(f"Error rendering {len(chunk)} emails from {chunk[0]['email']}: {error}")
+                continue
+            messages.extend(msg for msg in batch if msg is not None)
+        return messages
+
+
+class NotifyStage:
+    """
+    Email candidates whose status has a template, once per address. Sends over
+    pooled SMTP sessions unless another transport (spool, fake) is given.
+    """
+
+    def __init__(self, templates=None, delay=0.0, connections=2, transport=None):
+        self.templates = templates or TemplateSet()
+        if transport is None:
+            from app.emailer import SMTPTransport
+            transport = SMTPTransport(connections=connections, delay=delay)
+        self.transport = transport
+
+    def run(self, records, pool=None):
+        from app.emailer import print_result
+        recipients, skipped = select_recipients(records, self.templates)
+        for note in skipped:
+            print(note)
+        messages = RenderStage(self.templates).run(recipients, pool)
+        results = self.transport.send_all(messages, on_result=print_result)
+        sent_count = sum(1 for _, ok, _ in results if ok)
+        print(f"\nCompleted: Sent emails to {sent_count} candidates.")
+        return sent_count
+
+
+# ==== ENGINE ====
+
+class Engine:
+    """
+    Runs the stages end to end. `fetch`, `notify` and `ocr` are optional and
+    `tier` / `escalate` are passed to ScoreStage; with
+    workers > 1 one process pool is shared by the extract and score stages
+    (OCR always has its own).
+    `stats` is updated with every record as it is produced.
+    """
+
+    def __init__(self, jd_text, workers=1, cache_dir=None, dedupe=True, fetch=None, notify=None, scorer=None,
+                 ocr=None, tier=DEFAULT_TIER, escalate=False):
+        self.workers = workers
+        self.fetch = fetch
+        self.extract = ExtractStage(cache_dir, dedupe, ocr)
+        self.score = ScoreStage(jd_text, scorer, tier, escalate)
+        self.notify = notify
+        self.stats = BatchStats()
+
+    def iter_records(self, source=None):
+        if self.fetch is not None:
+            source = self.fetch.run()
+        self.stats = BatchStats()
+        if self.workers <= 1:
+            batch = self.extract.run(source)
+            for record in self.score.run(batch):
+                self.stats.add(record)
+                yield record
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            batch = self.extract.run(source, pool)
+            for record in self.score.run(batch, pool):
+                self.stats.add(record)
+                yield record
+
+    def run(self, source=None, output_file=None):
+        """Score the batch, optionally save it, then notify; returns the results DataFrame."""
+        df = pd.DataFrame(list(self.iter_records(source)))
+        if output_file:
+            from app.output import write_records
+            write_records(df, output_file)
+            print(f"✅ Parsing complete. Saved as '{output_file}'.")
+        if self.notify is not None and len(df):
+            self.notify.run(df.to_dict("records"))
+        return df
@@ -0,0 +1,67 @@
+# app/fetcher.py
+# Downloads PDF/DOCX resume attachments from an IMAP mailbox (Gmail by default).
+import email
+import imaplib
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+IMAP_EMAIL = os.getenv("EMAIL")
+IMAP_PASSWORD = os.getenv("APP_PASSWORD")  # App Password from Google Security Settings
+
+
+def iter_resume_attachments(subject, host="imap.gmail.com", user=None, password=None, mailbox="inbox"):
+    """Yield (filename, bytes) for every PDF/DOCX attachment on mails matching `subject`."""
+    mail = imaplib.IMAP4_SSL(host)
+    mail.login(user or IMAP_EMAIL, password or IMAP_PASSWORD)
+    try:
+        mail.select(mailbox)
+        # Search for emails by subject
+        result, data = mail.search(None, f'(SUBJECT "{subject}")')
+        for num in data[0].split():
+            result, msg_data = mail.fetch(num, "(RFC822)")
+            msg = email.message_from_bytes(msg_data[0][1])
+
+            for part in msg.walk():
+                if part.get_content_maintype() == "multipart":
+                    continue
+                if part.get("Content-Disposition") is None:
+                    continue
+
+                filename = part.get_filename()
+                if filename and filename.lower().endswith((".pdf", ".docx")):
+                    yield os.path.basename(filename), part.get_payload(decode=True)
+    finally:
+        mail.logout()
+
+
+def _free_path(folder, filename, data):
+    # Same name + same bytes means already saved; same name + different bytes
+    # (two candidates both sending "Resume.pdf") gets a numbered copy
+    base, ext = os.path.splitext(filename)
+    filepath, n = os.path.join(folder, filename), 1
+    while os.path.exists(filepath):
+        with open(filepath, "rb") as f:
+            if f.read() == data:
+                return None
+        filepath = os.path.join(folder, f"{base}_{n}{ext}")
+        n += 1
+    return filepath
+
+
+def iter_fetch_resumes(subject, download_folder, **imap_options):
+    """Save matching attachments into `download_folder`, yielding (path, bytes) for each new one."""
+    os.makedirs(download_folder, exist_ok=True)
+    for filename, data in iter_resume_attachments(subject, **imap_options):
+        filepath = _free_path(download_folder, filename, data)
+        if filepath is None:
+            continue  # already downloaded on an earlier run
+        with open(filepath, "wb") as f:
+            f.write(data)
+        print(f"Saved: {filename}")
+        yield filepath, data
+
+
+def fetch_resumes(subject, download_folder, **imap_options):
+    """Save matching attachments into `download_folder`; returns the saved paths."""
+    return [path for path, _ in iter_fetch_resumes(subject, download_folder, **imap_options)]
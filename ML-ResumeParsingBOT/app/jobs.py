@@ -0,0 +1,174 @@
+# app/jobs.py
+# Background jobs for the Streamlit UI: parsing and email sending run on a pool
+# while the page polls progress, shows partial results and can cancel.
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from app.parser import DEFAULT_TIER
+from app.engine import ExtractStage, ScoreStage, StageHooks, select_recipients
+from app.templates import TemplateSet, render_message
+
+
+# ==== JOBS ====
+
+class BackgroundJob:
+    """
+    Runs on its own driver thread and feeds work to `executor`, keeping at most a
+    couple of tasks per worker in flight so cancel() takes effect quickly.
+    Attributes read by the UI: stage, done, total, results, messages.
+    """
+
+    def __init__(self, executor, workers):
+        self.executor = executor
+        self.window = max(1, workers) * 2
+        self.stage = "queued"
+        self.done = 0
+        self.total = 0
+        self.results = []
+        self.messages = []  # (level, text), e.g. ("warning", "Skipping ...")
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._main, daemon=True)
+
+    def start(self):
+        self.started_at = time.time()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def running(self):
+        return self._thread.is_alive()
+
+    @property
+    def progress(self):
+        return self.done / self.total if self.total else 0.0
+
+    def _main(self):
+        try:
+            self.run()
+            self.stage = "cancelled" if self.cancelled else "finished"
+        except Exception as e:
+            self.messages.append(("error", f"Job failed: {e}"))
+            self.stage = "failed"
+        finally:
+            self.finished_at = time.time()
+
+    def run(self):
+        raise NotImplementedError
+
+    def _map(self, fn, tasks):
+        """Yield (key, result, error) as tasks finish; tasks are (key, args) pairs."""
+        tasks = iter(tasks)
+        pending = {}
+        while True:
+            while not self.cancelled and len(pending) < self.window:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                key, args = task
+                pending[self.executor.submit(fn, *args)] = key
+            if not pending:
+                return
+            finished, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+            for future in finished:
+                key = pending.pop(future)
+                if future.cancelled():
+                    continue
+                try:
+                    yield key, future.result(), None
+                except Exception as e:
+                    yield key, None, e
+            if self.cancelled:
+                for future in pending:
+                    future.cancel()
+
+
+class _JobHooks(StageHooks):
+    """Engine stage reports routed into a job's progress and messages."""
+
+    def __init__(self, job):
+        super().__init__(cancel=job._cancel, window=job.window)
+        self.job = job
+
+    def message(self, level, text):
+        self.job.messages.append((level, text))
+
+    def stage(self, name, total):
+        # Progress restarts for each step (extracting, scanning, parsing...)
+        self.job.stage = name
+        self.job.done, self.job.total = 0, total
+
+    def advance(self):
+        self.job.done += 1
+
+
+class ParseJob(BackgroundJob):
+    """Run the engine's extract and score stages over the uploads, as the CLI does."""
+
+    def __init__(self, uploads, jd_text, executor, workers, dedupe=True, ocr=None, cache_dir=None, scorer=None,
+                 tier=DEFAULT_TIER, escalate=False):
+        super().__init__(executor, workers)
+        self.uploads = uploads  # [(filename, bytes)]
+        self.extract = ExtractStage(cache_dir, dedupe, ocr)
+        self.score = ScoreStage(jd_text, scorer, tier, escalate)
+        self.total = len(uploads)
+
+    def run(self):
+        hooks = _JobHooks(self)
+        batch = self.extract.run(self.uploads, self.executor, hooks)
+        if self.cancelled:
+            return
+        for record in self.score.run(batch, self.executor, hooks):
+            self.results.append(record)
+
+
+class EmailJob(BackgroundJob):
+    """
+    Render every email up front on the pool, then stream them over `workers`
+    pooled SMTP connections (or `transport`); results holds the addresses that were sent.
+    """
+
+    def __init__(self, records, executor, workers, templates=None, transport=None):
+        super().__init__(executor, workers)
+        self.templates = templates or TemplateSet()
+        self.transport = transport
+        self.recipients, _ = select_recipients(records, self.templates)
+        self.connections = workers
+        self.total = len(self.recipients)
+        self.failed = []
+
+    def _sent(self, email, ok, error):
+        if ok:
+            self.results.append(email)
+        else:
+            self.failed.append(email)
+            self.messages.append(("error", f"Failed: {email} — {error}"))
+        self.done += 1
+
+    def run(self):
+        from app.emailer import SENDER_EMAIL, SMTPTransport
+        self.stage = "rendering"
+        rendered = {}
+        tasks = ((i, (self.templates, fields, SENDER_EMAIL)) for i, fields in enumerate(self.recipients))
+        for i, msg, error in self._map(render_message, tasks):
+            if error is not None:
+                self.messages.append(("error", f"Error rendering email for {self.recipients[i]['email']}: {error}"))
+            elif msg is not None:
+                rendered[i] = msg
+        if self.cancelled:
+            return
+
+        self.stage = "sending"
+        self.total = len(rendered)
+        messages = [rendered[i] for i in sorted(rendered)]
+        transport = self.transport or SMTPTransport(connections=self.connections)
+        transport.send_all(messages, on_result=self._sent, cancel=self._cancel)
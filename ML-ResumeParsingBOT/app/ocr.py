@@ -0,0 +1,124 @@
+# app/ocr.py
+# Optional OCR for scanned resumes. Only PDF pages without a text layer are
+# rendered and passed to Tesseract, on a separate small process pool so OCR
+# (seconds per page) never holds up normal parsing, and results are cached by
+# content hash so a scan is only ever OCR'd once.
+#
+# Needs `pip install pytesseract` and the tesseract binary on PATH; without
+# them OCR is reported as unavailable and scans are skipped as before.
+import shutil
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import pdfplumber
+
+from app.cache import TextCache, content_hash
+from app.utils import _open_source
+
+OCR_RESOLUTION = 300  # dpi; Tesseract accuracy drops noticeably below ~200
+
+
+def ocr_available():
+    try:
+        import pytesseract  # noqa: F401
+    except ImportError:
+        return False
+    return shutil.which("tesseract") is not None
+
+
+def ocr_pdf(data, resolution=OCR_RESOLUTION, lang="eng"):
+    """
+    Full text of a PDF where every page without a text layer is OCR'd from an
+    image of the page; the other pages keep their extracted text.
+    """
+    import pytesseract
+    pages = []
+    with pdfplumber.open(_open_source(data)) as pdf:
+        for page in pdf.pages:
+            try:
+                text = page.extract_text(keep_empty_lines=False) or ""
+                if not text.strip():
+                    image = page.to_image(resolution=resolution).original
+                    text = pytesseract.image_to_string(image, lang=lang).strip()
+                pages.append(text)
+            finally:
+                page.close()
+    return "\n".join(pages)
+
+
+class OCRStage:
+    """
+    Fills in the blank pages of scanned PDFs. Runs on its own pool of `workers`
+    processes with at most `workers * 2` documents queued, separate from the
+    parsing pool. Long-running apps can pass a `pool` to keep OCR processes
+    alive between batches.
+    """
+
+    def __init__(self, workers=1, cache_dir=None, resolution=OCR_RESOLUTION, lang="eng", pool=None):
+        self.workers = max(1, workers)
+        self.pool = pool
+        self.cache = TextCache(cache_dir) if cache_dir else None
+        self.resolution = resolution
+        self.lang = lang
+
+    def _cache_key(self, data):
+        return f"{content_hash(data)}-ocr-{self.lang}-{self.resolution}"
+
+    def _load(self, items):
+        # Files are read one at a time as the pool has room, not all up front
+        for key, filename, data in items:
+            if hasattr(data, "read"):
+                data.seek(0)
+                data = data.read()
+            elif not isinstance(data, (bytes, bytearray)):
+                with open(data, "rb") as f:
+                    data = f.read()
+            cached = self.cache.get(self._cache_key(data)) if self.cache else None
+            yield key, data, cached
+
+    def run(self, items):
+        """
+        items: (key, filename, data) with `data` a path or bytes.
+        Yields (key, text, error) as documents finish.
+        """
+        if not ocr_available():
+            for key, filename, _ in items:
+                yield key, None, RuntimeError(f"OCR unavailable (install pytesseract + tesseract): {filename}")
+            return
+
+        if self.pool is not None:
+            yield from self._run_on(self.pool, self._load(items))
+            return
+        # Processes are only started on the first submit, so an all-cached batch costs nothing
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            yield from self._run_on(pool, self._load(items))
+
+    def _run_on(self, pool, todo):
+        pending = {}
+        try:
+            while True:
+                # Bounded submission: scans are held in memory only while queued
+                while len(pending) < self.workers * 2:
+                    task = next(todo, None)
+                    if task is None:
+                        break
+                    key, data, cached = task
+                    if cached is not None:
+                        yield key, cached, None
+                        continue
+                    pending[pool.submit(ocr_pdf, data, self.resolution, self.lang)] = (key, data)
+                if not pending:
+                    return
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key, data = pending.pop(future)
+                    try:
+                        text = future.result()
+                    except Exception as e:
+                        yield key, None, e
+                        continue
+                    if self.cache:
+                        self.cache.put(self._cache_key(data), text)
+                    yield key, text, None
+        finally:
+            # Caller stopped early (e.g. a cancelled job): drop what has not started
+            for future in pending:
+                future.cancel()
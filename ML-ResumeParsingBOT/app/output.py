@@ -0,0 +1,63 @@
+# app/output.py
+# Reading and writing parsed-resume records as CSV or JSON Lines, either all at
+# once or streamed row by row for large batches.
+import csv
+import json
+import os
+import pandas as pd
+
+FORMATS = ("csv", "jsonl")
+
+
+def guess_format(path, default="csv"):
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in FORMATS else default
+
+
+class RecordWriter:
+    """Appends records to `path` one at a time and flushes each, so partial output survives a crash."""
+
+    def __init__(self, path, fmt=None):
+        self.fmt = fmt or guess_format(path)
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.file = open(path, "w", encoding="utf-8", newline="")
+        self._csv = None
+        self.count = 0
+
+    def write(self, record):
+        if self.fmt == "jsonl":
+            self.file.write(json.dumps(record, default=str) + "\n")
+        else:
+            if self._csv is None:
+                self._csv = csv.DictWriter(self.file, fieldnames=list(record.keys()))
+                self._csv.writeheader()
+            self._csv.writerow(record)
+        self.file.flush()
+        self.count += 1
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_records(df, path, fmt=None):
+    fmt = fmt or guess_format(path)
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == "jsonl":
+        df.to_json(path, orient="records", lines=True, force_ascii=False)
+    else:
+        df.to_csv(path, index=False)
+
+
+def read_records(path, fmt=None):
+    fmt = fmt or guess_format(path)
+    if fmt == "jsonl":
+        return pd.read_json(path, lines=True)
+    return pd.read_csv(path)
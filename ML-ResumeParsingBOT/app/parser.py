@@ -1,111 +1,170 @@
 # parser.py
 # Changed imports to be explicit as discussed previously
 from app.utils import (
-    extract_text_from_pdf, extract_text_from_docx,
-    extract_name, extract_email, extract_phone,
-    has_github, has_linkedin,
-    extract_experience_details, extract_education, extract_projects,
-    extract_section, extract_skills, compute_tfidf_match
+    extract_text, iter_pdf_pages,
+    extract_name, scan_contact_info,
+    extract_experience_details, education_grade, extract_projects,
+    extract_section, extract_skills, compute_tfidf_match, tier_points, ResumeText
 )
+from app.scoring import DEFAULT_SCORER
+from app.dedupe import find_duplicate_groups, contact_keys
+from app.cache import TextCache, content_hash
 import os
-import pandas as pd
-import streamlit as st # Keep this for st.info
-
-def parse_resumes_with_jd(folder_path, jd_text, output_file="parsed_resumes_final.csv"):
-    resume_data = []
-
-    for filename in os.listdir(folder_path):
-        if filename.lower().endswith(('.pdf', '.docx')):
-            path = os.path.join(folder_path, filename)
-
-            # Extract text
-            try: # Added try-except for robust text extraction
-                if filename.lower().endswith('.pdf'):
-                    text = extract_text_from_pdf(path)
-                else:
-                    text = extract_text_from_docx(path)
-                if not text.strip(): # Skip empty resumes
-                    st.warning(f"Skipping empty or unreadable resume: {filename}")
-                    continue
-            except Exception as e:
-                st.error(f"Error extracting text from {filename}: {e}")
-                continue
-
-
-            name = extract_name(text)
-            email = extract_email(text)
-            phone = extract_phone(text)
-            github = has_github(text)
-            linkedin = has_linkedin(text)
-            experience_section, years_of_experience, job_titles = extract_experience_details(text) # New returns
-            education_section, education_score = extract_education(text)
-            projects = extract_projects(text)
-            achievements = extract_section(text, ["ACHIEVEMENTS", "ACCOMPLISHMENTS", "AWARDS"])
-            tech_skills, soft_skills = extract_skills(text)
-            tfidf_score, jd_points = compute_tfidf_match(text, jd_text)
-
-            score = 0
-            # Base presence points
-            score += 10 if name else 0
-            score += 10 if email else 0
-            score += 10 if phone else 0
-            score += 3 if github else 0
-            score += 3 if linkedin else 0
-
-            # Education score from function
-            score += education_score
-
-            # Experience points - now includes years of experience
-            score += 5 if experience_section else 0 # Points for having an experience section
-            if years_of_experience >= 5: score += 10 # Senior experience
-            elif years_of_experience >= 2: score += 5 # Mid-level experience
-            else: score += 2 # Junior experience
-
-            score += 5 if projects else 0
-            score += 3 if achievements else 0 # Points for achievements
-
-            # Skill points (adjusted weights)
-            score += len(tech_skills) * 3.0 # Tech skills usually more critical
-            score += len(soft_skills) * 1.0
-
-            # JD Match points
-            score += jd_points
-
-            # Normalize score if it exceeds a certain maximum (optional, but good for consistent scaling)
-            # max_possible_score = ... calculate based on max points from all categories
-            # score = min(score, max_possible_score) # Cap the score
-
-
-            if score > 70: # Adjusted thresholds based on new scoring
-                status = "Shortlisted"
-            elif score > 45:
-                status = "To be Reviewed"
-            else:
-                status = "Rejected"
-
-            resume_data.append({
-                'Filename': filename,
-                'Name': name,
-                'Email': email,
-                'Phone': phone,
-                'LinkedIn': linkedin,
-                'GitHub': github,
-                'EducationScore': education_score,
-                'Education': education_section,
-                'YearsExperience': years_of_experience, # New field
-                'JobTitles': ', '.join(job_titles),    # New field
-                'TechSkills': ', '.join(tech_skills),
-                'SoftSkills': ', '.join(soft_skills),
-                'ExperienceDetails': experience_section, # Renamed for clarity
-                'Achievements': achievements,
-                'Projects': projects,
-                'JD_Match_Score': round(tfidf_score, 2),
-                'Status': status,
-                'Final_Score': round(score, 2)
-            })
-
-    df = pd.DataFrame(resume_data)
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    df.to_csv(output_file, index=False)
-    st.info(f"✅ Parsing complete. Saved as '{output_file}'.")
-    return df
\ No newline at end of file
+
+# How much NLP each tier runs. fast: regex and keywords only, no spaCy at all;
+# balanced: NER on the header window for the name; thorough: also NER over the
+# whole resume when the header has no name, and noun-chunk skill mining.
+TIERS = {
+    "fast": {"name_ner": False, "full_ner": False, "noun_chunks": False},
+    "balanced": {"name_ner": True, "full_ner": False, "noun_chunks": False},
+    "thorough": {"name_ner": True, "full_ner": True, "noun_chunks": True},
+}
+DEFAULT_TIER = "thorough"
+ESCALATE_STATUS = "To be Reviewed"  # borderline candidates worth a thorough second look
+
+
+def parse_resume_text(filename, text, jd_text, scorer=None, tier=DEFAULT_TIER):
+    """
+    Extract fields from one resume's text and score it against the JD, with
+    `scorer` (an app.scoring.Scorer; the default profile if None) and the
+    extraction depth of `tier` (see TIERS).
+    """
+    if tier not in TIERS:
+        raise ValueError(f"Unknown pipeline tier '{tier}' (choose from {', '.join(TIERS)})")
+    options = TIERS[tier]
+    doc = ResumeText(text) # Normalized and lower-cased once for every extractor below
+    name = extract_name(doc, options["name_ner"], options["full_ner"])
+    email, phone, github, linkedin = scan_contact_info(doc) # One pass for all contact fields
+    experience_section, years_of_experience, job_titles, spans = extract_experience_details(doc) # New returns
+    education_section = extract_section(doc, ["EDUCATION", "ACADEMIC BACKGROUND"],
+                                        next_section_keywords=["EXPERIENCE", "SKILLS", "PROJECTS"])
+    grade = education_grade(education_section)
+    projects = extract_projects(doc)
+    achievements = extract_section(doc, ["ACHIEVEMENTS", "ACCOMPLISHMENTS", "AWARDS"])
+    tech_skills, soft_skills = extract_skills(doc, options["noun_chunks"])
+    tfidf_score, _ = compute_tfidf_match(doc.text, jd_text)
+
+    # Weights, tiers and status thresholds all come from the scoring profile
+    scorer = scorer or DEFAULT_SCORER
+    score, status = scorer.score({
+        "name": bool(name), "email": bool(email), "phone": bool(phone),
+        "github": github, "linkedin": linkedin,
+        "experience": bool(experience_section), "projects": bool(projects), "achievements": bool(achievements),
+        "years": years_of_experience, "education_grade": grade, "jd_match": tfidf_score,
+        "tech_skills": tech_skills, "soft_skills": soft_skills,
+    })
+
+    return {
+        'Filename': filename,
+        'Name': name,
+        'Email': email,
+        'Phone': phone,
+        'LinkedIn': linkedin,
+        'GitHub': github,
+        'EducationScore': tier_points(grade, scorer.education_tiers),
+        'EducationGrade': grade,
+        'Education': education_section,
+        'YearsExperience': years_of_experience, # New field
+        'JobTitles': ', '.join(job_titles),    # New field
+        'ExperienceTimeline': '; '.join(str(span) for span in spans),
+        'TechSkills': ', '.join(tech_skills),
+        'SoftSkills': ', '.join(soft_skills),
+        'ExperienceDetails': experience_section, # Renamed for clarity
+        'Achievements': achievements,
+        'Projects': projects,
+        'JD_Match_Score': round(tfidf_score, 2),
+        'Status': status,
+        'Final_Score': score,
+        'ScoringProfile': scorer.name,
+        'PipelineTier': tier
+    }
+
+
+def _resume_sources(source):
+    # A folder path, or (filename, bytes / file-like) pairs straight from an upload
+    if isinstance(source, (str, os.PathLike)):
+        return [(f, os.path.join(source, f)) for f in sorted(os.listdir(source))
+                if f.lower().endswith(('.pdf', '.docx'))]
+    return [(name, data) for name, data in source if name.lower().endswith(('.pdf', '.docx'))]
+
+
+def group_duplicates(filenames, texts, dedupe=True):
+    """
+    Group re-submissions (near-identical text, or same email/phone) so each candidate
+    is parsed once. Returns (index to parse, [duplicate filenames]) per candidate.
+    """
+    if dedupe:
+        contacts = [contact_keys(*scan_contact_info(t)[:2]) for t in texts]
+        groups = find_duplicate_groups(texts, contacts)
+    else:
+        groups = [[i] for i in range(len(texts))]
+
+    out = []
+    for group in groups:
+        # Keep the most complete copy (longest text) as the candidate's resume
+        keep = max(group, key=lambda i: (len(texts[i]), filenames[i]))
+        out.append((keep, [filenames[i] for i in group if i != keep]))
+    return out
+
+
+def extract_resume_pages(filename, data, cache_dir=None):
+    """
+    (text, blank_pages) of one resume; blank_pages counts PDF pages with no text
+    layer (scans) that the OCR stage could fill in. Uses the text cache if given.
+    """
+    if cache_dir is not None:
+        if isinstance(data, (str, os.PathLike)):
+            with open(data, "rb") as f:
+                data = f.read()
+        elif hasattr(data, "read"):
+            data.seek(0)
+            data = data.read()
+        cache = TextCache(cache_dir)
+        key = content_hash(data)
+        text = cache.get(key)
+        if text is not None:
+            return text, int(cache.get(key + "-blank") or 0)
+
+    if filename.lower().endswith(".pdf"):
+        pages = list(iter_pdf_pages(data))
+        text = "\n".join(pages)
+        blank_pages = sum(1 for page in pages if not page.strip())
+    else:
+        text, blank_pages = extract_text(data, filename), 0
+    if cache_dir is not None:
+        cache.put(key, text)
+        cache.put(key + "-blank", str(blank_pages))
+    return text, blank_pages
+
+
+def extract_resume_text(filename, data, cache_dir=None):
+    """Text of one resume; `data` is a path, bytes or file-like. Uses the text cache if given."""
+    return extract_resume_pages(filename, data, cache_dir)[0]
+
+
+def iter_parsed_resumes(source, jd_text, dedupe=True, workers=1, cache_dir=None, tier=DEFAULT_TIER,
+                        escalate=False):
+    """
+    Parse and score a batch of resumes, yielding one record per candidate as it
+    is produced. See parse_resumes_with_jd for the arguments.
+    """
+    from app.engine import Engine
+    return Engine(jd_text, workers=workers, cache_dir=cache_dir, dedupe=dedupe, tier=tier,
+                  escalate=escalate).iter_records(source)
+
+
+def parse_resumes_with_jd(source, jd_text, output_file="parsed_resumes_final.csv", dedupe=True,
+                          workers=1, cache_dir=None, tier=DEFAULT_TIER, escalate=False):
+    """
+    Parse and score a batch of resumes against a JD.
+
+    `source` is either a folder of PDF/DOCX files or an iterable of
+    (filename, bytes or file-like) pairs for in-memory uploads.
+    Pass output_file=None to skip writing the CSV. `workers` > 1 extracts and
+    parses in that many processes; `cache_dir` reuses text extracted on earlier runs.
+    `tier` is "fast", "balanced" or "thorough" (see TIERS); with `escalate`,
+    candidates a cheaper tier scores "To be Reviewed" are re-parsed thoroughly.
+    """
+    from app.engine import Engine
+    return Engine(jd_text, workers=workers, cache_dir=cache_dir, dedupe=dedupe, tier=tier,
+                  escalate=escalate).run(source, output_file)
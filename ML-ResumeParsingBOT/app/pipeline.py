@@ -0,0 +1,257 @@
+# app/pipeline.py
+# Overlapped fetch -> parse -> notify. Attachments go from the IMAP fetcher to
+# the parser processes, and scored candidates to the notifier, through bounded
+# queues. The network, the CPU and SMTP all work at the same time, so a mailbox
+# sweep takes about as long as its slowest stage instead of the sum of all three.
+# A full queue blocks the stage feeding it (backpressure), so memory stays
+# bounded however big the mailbox is.
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import pandas as pd
+
+from app.dedupe import contact_keys
+from app.engine import select_recipients
+from app.parser import _resume_sources, extract_resume_text, parse_resume_text
+from app.stats import BatchStats
+from app.templates import render_message
+
+_DONE = object()  # end-of-stream marker passed down each queue
+
+
+def extract_and_parse(filename, data, jd_text, cache_dir=None, scorer=None):
+    """One resume start to finish in a worker process; (record or None if unreadable, seconds)."""
+    start = time.perf_counter()
+    text = extract_resume_text(filename, data, cache_dir)
+    record = parse_resume_text(filename, text, jd_text, scorer) if text.strip() else None
+    return record, time.perf_counter() - start
+
+
+class Pipeline:
+    """
+    Runs fetch, parse and notify concurrently. `fetch` is a FetchStage, or None
+    to pass a folder or (filename, bytes) pairs to run() instead; `notify` is a
+    NotifyStage or None to only parse. Each queue holds at most `queue_size`
+    items. Re-submissions are matched by email / phone as records arrive
+    (near-duplicate text needs the whole batch, so only Engine does that).
+    """
+
+    def __init__(self, jd_text, fetch=None, notify=None, workers=2, queue_size=16, cache_dir=None, scorer=None):
+        self.jd_text = jd_text
+        self.fetch = fetch
+        self.notify = notify
+        self.workers = max(1, workers)
+        self.queue_size = queue_size
+        self.cache_dir = cache_dir
+        self.scorer = scorer
+        self.stats = BatchStats()
+        self.counts = defaultdict(int)
+        self.busy = defaultdict(float)  # seconds each stage spent working, not waiting on a queue
+        self.errors = []
+        self._stop = threading.Event()  # set when a stage fails, so no other stage waits on it forever
+        self._failure = None
+
+    # ==== STAGES ====
+
+    def _fail(self, error):
+        if self._failure is None:
+            self._failure = error
+        self._stop.set()
+
+    def _put(self, q, item, stage=None):
+        """Block while `q` is full; False if the run was stopped meanwhile (nobody will take the item)."""
+        start = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        finally:
+            if stage is not None:
+                # Time blocked on a full queue is backpressure, not work
+                self.busy[stage] -= time.perf_counter() - start
+
+    def _get(self, q, timeout=None):
+        """Next item of `q`; _DONE once the run is stopped. Raises queue.Empty after `timeout` seconds."""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while not self._stop.is_set():
+            wait_for = 0.1 if deadline is None else min(0.1, deadline - time.perf_counter())
+            try:
+                return q.get(timeout=max(0.0, wait_for))
+            except queue.Empty:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    raise
+        return _DONE
+
+    def _run_fetch(self, source, out):
+        start = time.perf_counter()
+        try:
+            if source is None:
+                from app.fetcher import iter_fetch_resumes
+                source = ((os.path.basename(path), data) for path, data in
+                          iter_fetch_resumes(self.fetch.subject, self.fetch.folder, **self.fetch.imap_options))
+            elif isinstance(source, (str, os.PathLike)):
+                source = _resume_sources(source)  # (filename, path); workers read the files themselves
+            for filename, data in source:
+                if not filename.lower().endswith(('.pdf', '.docx')):
+                    continue
+                self.counts["fetched"] += 1
+                if not self._put(out, (filename, data), "fetch"):
+                    return  # a later stage failed
+        except Exception as e:
+            self.errors.append(f"Fetching stopped: {e}")
+            print(f"Error fetching resumes: {e}")
+        finally:
+            self.busy["fetch"] += time.perf_counter() - start
+            self._put(out, _DONE)
+
+    def _run_parse(self, inbox, out):
+        limit = self.workers * 2  # tasks in flight; the rest wait in the fetch queue
+        pending = {}
+        fetching = True
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as pool:
+                while (fetching or pending) and not self._stop.is_set():
+                    while fetching and len(pending) < limit:
+                        try:
+                            # Block only when there is nothing to collect either
+                            item = self._get(inbox, timeout=0.05 if pending else None)
+                        except queue.Empty:
+                            break
+                        if item is _DONE:
+                            fetching = False
+                            break
+                        filename, data = item
+                        future = pool.submit(extract_and_parse, filename, data, self.jd_text,
+                                             self.cache_dir, self.scorer)
+                        pending[future] = filename
+                    if not pending:
+                        continue
+                    finished, _ = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        filename = pending.pop(future)
+                        try:
+                            record, seconds = future.result()
+                        except BrokenProcessPool:
+                            raise  # a worker died (e.g. killed for memory): nothing else can run either
+                        except Exception as e:
+                            self.errors.append(f"{filename}: {e}")
+                            print(f"Error parsing {filename}: {e}")
+                            continue
+                        self.busy["parse"] += seconds / self.workers
+                        if record is None:
+                            print(f"Skipping empty or unreadable resume: {filename}")
+                            self.counts["unreadable"] += 1
+                            continue
+                        if not self._put(out, record):  # blocks while the collector / notifier are behind
+                            return
+                    if self._stop.is_set():
+                        for future in pending:
+                            future.cancel()
+        except Exception as e:
+            print(f"Parsing stopped: {e}")
+            self._fail(e)
+        finally:
+            self._put(out, _DONE)
+
+    def _run_notify(self, inbox):
+        from app.emailer import SENDER_EMAIL, print_result
+        templates = self.notify.templates
+        emailed = set()
+
+        def messages():
+            while True:
+                start = time.perf_counter()
+                record = self._get(inbox)
+                self.busy["notify"] -= time.perf_counter() - start
+                if record is _DONE:
+                    return
+                recipients, _ = select_recipients([record], templates, emailed)
+                for fields in recipients:
+                    msg = render_message(templates, fields, SENDER_EMAIL)
+                    if msg is not None:
+                        yield msg
+
+        start = time.perf_counter()
+        try:
+            results = self.notify.transport.send_all(messages(), on_result=print_result)
+        except Exception as e:
+            print(f"Notifying stopped: {e}")
+            self._fail(e)
+            return
+        finally:
+            self.busy["notify"] += time.perf_counter() - start
+        self.counts["emailed"] = sum(1 for _, ok, _ in results if ok)
+
+    # ==== RUN ====
+
+    def run(self, source=None, output_file=None):
+        """
+        Sweep the mailbox (or `source`); returns the results DataFrame once every
+        stage is done. If the parse or notify stage fails (e.g. a worker process
+        is killed), every stage is stopped and the error is raised here.
+        """
+        self._stop.clear()
+        self._failure = None
+        fetched = queue.Queue(maxsize=self.queue_size)
+        scored = queue.Queue(maxsize=self.queue_size)
+        to_notify = queue.Queue(maxsize=self.queue_size)
+        start = time.perf_counter()
+
+        threads = [threading.Thread(target=self._run_fetch, args=(source, fetched), daemon=True),
+                   threading.Thread(target=self._run_parse, args=(fetched, scored), daemon=True)]
+        if self.notify is not None:
+            threads.append(threading.Thread(target=self._run_notify, args=(to_notify,), daemon=True))
+        for t in threads:
+            t.start()
+
+        # Collector: drop re-submissions by email/phone as they arrive, then hand on
+        records, owner = [], {}  # contact key -> index of the record that claimed it
+        while True:
+            record = self._get(scored)
+            if record is _DONE:
+                break
+            keys = contact_keys(record.get("Email", ""), str(record.get("Phone", "")))
+            first = next((owner[k] for k in keys if k in owner), None)
+            if first is not None:
+                kept = records[first]
+                kept["DuplicateFiles"] = ", ".join(f for f in [kept["DuplicateFiles"], record["Filename"]] if f)
+                self.counts["duplicates"] += 1
+                continue
+            record["DuplicateFiles"] = ""
+            for key in keys:
+                owner[key] = len(records)
+            records.append(record)
+            self.stats.add(record)
+            self.counts["parsed"] += 1
+            if self.notify is not None and not self._put(to_notify, record):
+                break
+        if self.notify is not None:
+            self._put(to_notify, _DONE)
+        for t in threads:
+            t.join()
+        if self._failure is not None:
+            raise self._failure
+
+        wall = time.perf_counter() - start
+        df = pd.DataFrame(records)
+        if output_file:
+            from app.output import write_records
+            write_records(df, output_file)
+            print(f"✅ Parsing complete. Saved as '{output_file}'.")
+        print(self.report(wall))
+        return df
+
+    def report(self, wall):
+        busy = ", ".join(f"{stage} {self.busy[stage]:.1f}s" for stage in ("fetch", "parse", "notify")
+                         if stage in self.busy)
+        c = self.counts
+        return (f"Pipeline: fetched {c['fetched']}, parsed {c['parsed']}, duplicates {c['duplicates']}, "
+                f"unreadable {c['unreadable']}, emailed {c['emailed']} in {wall:.1f}s (busy: {busy})")
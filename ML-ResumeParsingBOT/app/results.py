@@ -0,0 +1,61 @@
+# app/results.py
+# Server-side filtering, paging and export for the results table, so the UI
+# only ever sends one page of short columns to the browser, even with 50k rows.
+# Filters run on the compact CandidateTable (numpy columns + skill bitsets);
+# long text sections are fetched one candidate at a time when asked for.
+import numpy as np
+
+from app.candidates import CandidateTable
+
+# Shown in the table; everything else is only in the details view and the export
+SUMMARY_COLUMNS = ["Filename", "Name", "Email", "Phone", "Status", "Final_Score", "YearsExperience",
+                   "JD_Match_Score", "TechSkills", "DuplicateFiles"]
+LONG_TEXT_COLUMNS = ["ExperienceDetails", "ExperienceTimeline", "Education", "Projects", "Achievements", "JobTitles", "SoftSkills"]
+
+
+class ResultsView:
+    """A parsed batch prepared once for repeated filter / page / export calls."""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self.table = CandidateTable.from_records(self.df.to_dict("records"))
+        self.summary_columns = [c for c in SUMMARY_COLUMNS if c in self.df.columns]
+        self._exports = {}  # filter key -> CSV bytes, built on first download
+
+    def __len__(self):
+        return len(self.df)
+
+    def statuses(self):
+        return sorted(self.table.statuses)
+
+    def skills(self):
+        """Skills at least one candidate has, for the filter picker."""
+        if not len(self):
+            return []
+        used = np.bitwise_or.reduce(self.table.bits[:len(self)], axis=0)
+        return sorted(name for i, name in enumerate(self.table.vocab.names)
+                      if int(used[i >> 6]) >> (i & 63) & 1)
+
+    def score_range(self):
+        scores = self.table.scores[:len(self)]
+        return (float(scores.min()), float(scores.max())) if len(scores) else (0.0, 0.0)
+
+    def select(self, statuses=None, score_range=None, skills=()):
+        """Row positions matching the filters, best score first."""
+        low, high = score_range if score_range else (None, None)
+        return self.table.select(all_skills=skills, statuses=statuses, min_score=low, max_score=high)
+
+    def page(self, rows, number, size=50):
+        """Summary columns of page `number` (from 0) of `rows`."""
+        start = number * size
+        return self.df.iloc[rows[start:start + size]][self.summary_columns]
+
+    def details(self, row):
+        record = self.df.iloc[row]
+        return {c: record[c] for c in LONG_TEXT_COLUMNS if c in self.df.columns}
+
+    def export_csv(self, rows, key):
+        """CSV of the full rows, encoded once per distinct filter `key`."""
+        if key not in self._exports:
+            self._exports = {key: self.df.iloc[rows].to_csv(index=False).encode("utf-8")}  # only the latest
+        return self._exports[key]
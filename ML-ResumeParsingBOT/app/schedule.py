@@ -0,0 +1,96 @@
+# app/schedule.py
+# Cost estimates for size-aware scheduling. Parsing cost varies ~100x between a
+# one-page DOCX and a 30-page portfolio PDF; handing files to the pool in
+# folder order can leave one worker on a huge file at the end while the rest
+# sit idle. Submitting the most expensive files first (longest processing time
+# first) lets the small ones fill the gaps.
+#
+# The pool's single shared task queue does the balancing at run time: a worker
+# that finishes early takes the next task, so no worker is pinned to a fixed
+# share of the batch.
+import os
+import re
+
+# Rough cost units: one unit ~ one PDF page
+PDF_BYTES_PER_UNIT = 512 * 1024    # embedded images / fonts still cost something to skip past
+DOCX_BYTES_PER_UNIT = 16 * 1024    # zipped XML is dense text
+TEXT_CHARS_PER_UNIT = 3000         # about a page of extracted text
+SCAN_BYTES = 64 * 1024             # read from each end of a PDF to find its page count
+
+_PAGES_COUNT = re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)|/Count\s+(\d+)[^>]*?/Type\s*/Pages\b')
+_PAGE_OBJECT = re.compile(rb'/Type\s*/Page\b(?!s)')
+
+
+def pdf_page_count(data, complete=True):
+    """
+    Page count from the PDF's page tree, without parsing the document: the
+    largest /Count of a /Pages node (the root), else the number of /Page
+    objects when `data` is the whole file. None when neither is found (e.g.
+    the page tree is inside compressed object streams).
+    """
+    counts = [int(a or b) for a, b in _PAGES_COUNT.findall(data)]
+    if counts:
+        return max(counts)
+    if not complete:
+        return None  # counting /Page objects in part of the file would undercount
+    pages = len(_PAGE_OBJECT.findall(data))
+    return pages or None
+
+
+def _head_tail(data, size):
+    """At most SCAN_BYTES from each end of `data` (path, bytes or file-like) and whether that is all of it."""
+    if size <= 2 * SCAN_BYTES:
+        spans = [(0, size)]
+    else:
+        spans = [(0, SCAN_BYTES), (size - SCAN_BYTES, SCAN_BYTES)]
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        chunks = [bytes(data[start:start + length]) for start, length in spans]
+    elif hasattr(data, "read"):
+        position = data.tell()
+        chunks = []
+        for start, length in spans:
+            data.seek(start)
+            chunks.append(data.read(length))
+        data.seek(position)
+    else:
+        with open(data, "rb") as f:
+            chunks = []
+            for start, length in spans:
+                f.seek(start)
+                chunks.append(f.read(length))
+    return b"\n".join(chunks), len(spans) == 1
+
+
+def _size(data):
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return len(data)
+    if hasattr(data, "read"):
+        position = data.tell()
+        size = data.seek(0, os.SEEK_END)
+        data.seek(position)
+        return size
+    return os.path.getsize(data)
+
+
+def estimate_cost(filename, data):
+    """
+    Expected extraction + parsing cost of one resume, in ~pages; `data` is a
+    path, bytes or file-like. Only the size and, for PDFs, at most SCAN_BYTES
+    from each end (where writers put the page tree root) are read.
+    """
+    size = _size(data)
+    if filename.lower().endswith(".pdf"):
+        pages = pdf_page_count(*_head_tail(data, size))
+        if pages is None:  # page tree not in the scanned ends: guess from the size
+            return max(1.0, 4 * size / PDF_BYTES_PER_UNIT)
+        return pages + size / PDF_BYTES_PER_UNIT
+    return 1.0 + size / DOCX_BYTES_PER_UNIT
+
+
+def text_cost(text):
+    return 1.0 + len(text) / TEXT_CHARS_PER_UNIT
+
+
+def largest_first(costs):
+    """Positions of `costs`, most expensive first (ties keep input order)."""
+    return sorted(range(len(costs)), key=lambda i: -costs[i])
@@ -0,0 +1,256 @@
+# app/scoring.py
+# Scoring profiles: every weight, tier and status threshold used to turn parsed
+# resume fields into Final_Score / Status, kept as data instead of literals.
+#
+# A profile is a JSON file; keys left out keep the default value:
+#
+#     {
+#       "name": "data-scientist",
+#       "presence": {"github": 5},
+#       "skills": {"tech_per_skill": 4.0, "boosts": {"pytorch": 3, "sql": 1}},
+#       "jd_match_tiers": [[25, 20], [15, 10], [5, 3]],
+#       "thresholds": {"Shortlisted": 75, "To be Reviewed": 50}
+#     }
+#
+# Profiles are validated and compiled once into a Scorer. Scorer.score_record()
+# works from an already-parsed output row, so a batch can be re-scored under a
+# new profile without extracting or parsing anything again.
+import copy
+import json
+import math
+import os
+import threading
+import time
+
+from app.utils import EDUCATION_GRADE_TIERS, JD_MATCH_TIERS, tier_points
+
+DEFAULT_PROFILE = {
+    "name": "default",
+    # Points for having each field / section at all
+    "presence": {"name": 10, "email": 10, "phone": 10, "github": 3, "linkedin": 3,
+                 "experience": 5, "projects": 5, "achievements": 3},
+    # [minimum, points] pairs, highest first; the first tier reached wins
+    "experience_years_tiers": [[5, 10], [2, 5], [0, 2]],
+    "education_grade_tiers": [list(t) for t in EDUCATION_GRADE_TIERS],
+    "jd_match_tiers": [list(t) for t in JD_MATCH_TIERS],
+    "skills": {"tech_per_skill": 3.0, "soft_per_skill": 1.0,
+               "boosts": {}},  # extra points for specific skills, e.g. {"python": 2}
+    # A score strictly above a threshold gets that status; below both is Rejected
+    "thresholds": {"Shortlisted": 70, "To be Reviewed": 45},
+}
+
+PRESENCE_FIELDS = tuple(DEFAULT_PROFILE["presence"])
+TIER_KEYS = ("experience_years_tiers", "education_grade_tiers", "jd_match_tiers")
+
+
+# ==== VALIDATION ====
+
+def _number(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{where} must be a number, got {value!r}")
+    return float(value)
+
+
+def _tiers(value, where):
+    if not isinstance(value, list):
+        raise ValueError(f"{where} must be a list of [minimum, points] pairs")
+    tiers = []
+    for i, pair in enumerate(value):
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2:
+            raise ValueError(f"{where}[{i}] must be a [minimum, points] pair")
+        _number(pair[1], f"{where}[{i}][1]")
+        tiers.append((_number(pair[0], f"{where}[{i}][0]"), pair[1]))
+    if [m for m, _ in tiers] != sorted((m for m, _ in tiers), reverse=True):
+        raise ValueError(f"{where} must be ordered from the highest minimum down")
+    return tuple(tiers)
+
+
+def _check_keys(section, allowed, where):
+    unknown = set(section) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown key(s) in {where}: {', '.join(sorted(unknown))}")
+
+
+def merge_profile(overrides):
+    """Default profile with `overrides` applied one section deep."""
+    profile = copy.deepcopy(DEFAULT_PROFILE)
+    if not isinstance(overrides, dict):
+        raise ValueError("A scoring profile must be a JSON object")
+    _check_keys(overrides, DEFAULT_PROFILE, "profile")
+    for key, value in overrides.items():
+        if isinstance(profile[key], dict):
+            # presence / skills / thresholds are merged key by key, so they must be objects too
+            if not isinstance(value, dict):
+                raise ValueError(f"{key} must be a JSON object, got {value!r}")
+            if key == "skills":
+                _check_keys(value, profile[key], key)
+                if "boosts" in value and not isinstance(value["boosts"], dict):
+                    raise ValueError("skills.boosts must map skill names to points")
+            elif key == "presence":
+                _check_keys(value, PRESENCE_FIELDS, key)
+            profile[key].update(value)
+        elif key == "name" and not isinstance(value, str):
+            raise ValueError(f"name must be a string, got {value!r}")
+        else:
+            profile[key] = value  # tier lists, checked by _tiers()
+    return profile
+
+
+# ==== SCORER ====
+
+class Scorer:
+    """A validated profile, flattened into tuples so scoring is plain arithmetic."""
+
+    def __init__(self, profile=None):
+        profile = merge_profile(profile or {})
+        self.name = str(profile["name"])
+        self.presence = tuple((field, _number(profile["presence"][field], f"presence.{field}"))
+                              for field in PRESENCE_FIELDS)
+        self.experience_tiers, self.education_tiers, self.jd_tiers = (
+            _tiers(profile[key], key) for key in TIER_KEYS)
+        skills = profile["skills"]
+        self.tech_weight = _number(skills["tech_per_skill"], "skills.tech_per_skill")
+        self.soft_weight = _number(skills["soft_per_skill"], "skills.soft_per_skill")
+        if not isinstance(skills["boosts"], dict):
+            raise ValueError("skills.boosts must map skill names to points")
+        self.boosts = {str(k).strip().lower(): _number(v, f"skills.boosts.{k}") for k, v in skills["boosts"].items()}
+
+        thresholds = profile["thresholds"]
+        _check_keys(thresholds, DEFAULT_PROFILE["thresholds"], "thresholds")
+        self.shortlist = _number(thresholds.get("Shortlisted"), "thresholds.Shortlisted")
+        self.review = _number(thresholds.get("To be Reviewed"), "thresholds.To be Reviewed")
+        if self.review > self.shortlist:
+            raise ValueError("thresholds: 'To be Reviewed' must not be above 'Shortlisted'")
+
+    @classmethod
+    def from_file(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            try:
+                profile = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}: {e}") from None
+        return cls(profile)
+
+    def status(self, score):
+        if score > self.shortlist:
+            return "Shortlisted"
+        if score > self.review:
+            return "To be Reviewed"
+        return "Rejected"
+
+    def score(self, features):
+        """(Final_Score, Status) from the features dict built by parse_resume_text / features_from_record."""
+        score = 0.0
+        for field, points in self.presence:
+            if features[field]:
+                score += points
+        score += tier_points(features["years"], self.experience_tiers)
+        if features["education_grade"] is not None or features.get("education_points") is None:
+            score += tier_points(features["education_grade"], self.education_tiers)
+        else:
+            score += features["education_points"]  # row parsed before EducationGrade was recorded
+        score += tier_points(features["jd_match"], self.jd_tiers)
+        score += len(features["tech_skills"]) * self.tech_weight
+        score += len(features["soft_skills"]) * self.soft_weight
+        if self.boosts:
+            for skill in features["tech_skills"] + features["soft_skills"]:
+                score += self.boosts.get(skill.lower(), 0.0)
+        return round(score, 2), self.status(score)
+
+    def score_record(self, record):
+        return self.score(features_from_record(record))
+
+    def rescore(self, record):
+        """Copy of a parsed output row with Final_Score / Status under this profile."""
+        score, status = self.score_record(record)
+        return {**record, "Final_Score": score, "Status": status, "ScoringProfile": self.name}
+
+
+def _present(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return False
+    if isinstance(value, str):
+        return bool(value.strip()) and value.strip().lower() not in ("nan", "false")
+    return bool(value)
+
+
+def _float(value, default=None):
+    try:
+        value = float(value)
+    except (TypeError, ValueError):
+        return default
+    return default if math.isnan(value) else value
+
+
+def _split(value):
+    return [s.strip() for s in value.split(",") if s.strip()] if isinstance(value, str) else []
+
+
+def features_from_record(record):
+    """Scoring features back out of a parsed output row (CSV / JSONL / DataFrame row)."""
+    return {
+        "name": _present(record.get("Name")),
+        "email": _present(record.get("Email")),
+        "phone": _present(record.get("Phone")),
+        "github": _present(record.get("GitHub")),
+        "linkedin": _present(record.get("LinkedIn")),
+        "experience": _present(record.get("ExperienceDetails")),
+        "projects": _present(record.get("Projects")),
+        "achievements": _present(record.get("Achievements")),
+        "years": _float(record.get("YearsExperience"), 0.0),
+        "education_grade": _float(record.get("EducationGrade")),
+        "education_points": _float(record.get("EducationScore")),
+        "jd_match": _float(record.get("JD_Match_Score"), 0.0),
+        "tech_skills": _split(record.get("TechSkills")),
+        "soft_skills": _split(record.get("SoftSkills")),
+    }
+
+
+DEFAULT_SCORER = Scorer()
+
+
+# ==== HOT RELOAD ====
+
+class ProfileLoader:
+    """
+    Keeps the Scorer for a profile file current in long-running processes: the
+    file's mtime is checked at most every `check_every` seconds and a changed
+    file is recompiled. An edit that fails validation is reported and the last
+    good profile stays in use.
+    """
+
+    def __init__(self, path=None, check_every=2.0):
+        self.path = path
+        self.check_every = check_every
+        self.lock = threading.Lock()
+        self._scorer = Scorer.from_file(path) if path else DEFAULT_SCORER
+        self._mtime = os.stat(path).st_mtime_ns if path else None
+        self._checked = time.monotonic()
+        self.version = 1  # bumped on every successful reload
+
+    def current(self):
+        if self.path is None:
+            return self._scorer
+        now = time.monotonic()
+        with self.lock:
+            if now - self._checked >= self.check_every:
+                self._checked = now
+                self._reload()
+            return self._scorer
+
+    def _reload(self):
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError as e:
+            print(f"Scoring profile unavailable, keeping '{self._scorer.name}': {e}")
+            return
+        if mtime == self._mtime:
+            return
+        self._mtime = mtime
+        try:
+            self._scorer = Scorer.from_file(self.path)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Invalid scoring profile {self.path}, keeping '{self._scorer.name}': {e}")
+            return
+        self.version += 1
+        print(f"Reloaded scoring profile '{self._scorer.name}' from {self.path}")
@@ -0,0 +1,262 @@
+# app/server.py
+# Local HTTP scoring API. Parsing runs in a pool of worker processes that load
+# the spaCy model once at startup, so requests never pay the model load cost.
+import asyncio
+import time
+import uuid
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from aiohttp import web
+
+from app.scoring import ProfileLoader
+
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+LATENCY_SAMPLES = 1000  # per endpoint, most recent requests only
+JOB_TTL_SECONDS = 3600  # finished batch jobs (and their results) are kept this long
+MAX_FINISHED_JOBS = 100  # and at most this many, oldest dropped first
+
+WARMUP_TEXT = """John Smith
+john.smith@example.com | +91 9876543210 | linkedin.com/in/jsmith | github.com/jsmith
+EXPERIENCE
+Software Engineer, 2 years of experience with Python and SQL
+EDUCATION
+B.Tech Computer Science, CGPA: 8.5/10
+"""
+
+
+# ==== WORKER PROCESS ====
+
+def _warm_worker():
+    # Importing app.utils loads the spaCy model; one throwaway parse compiles the
+    # regexes and TF-IDF code paths so the first real request is not slower.
+    from app.parser import parse_resume_text
+    parse_resume_text("warmup.txt", WARMUP_TEXT, WARMUP_TEXT)
+
+
+def _jd_in_worker(filename, data):
+    from app.utils import load_jd_text
+    return load_jd_text(data, filename)
+
+
+def _parse_in_worker(filename, data, jd_text, scorer=None):
+    from app.parser import parse_resume_text
+    from app.utils import extract_text
+    try:
+        text = extract_text(data, filename)
+    except ValueError:
+        raise
+    except Exception as e:
+        # Corrupt uploads fail in pdfminer / zipfile / XML with their own errors; all map to a 422
+        raise ValueError(f"Could not read resume {filename}: {type(e).__name__}: {e}") from None
+    if not text.strip():
+        raise ValueError(f"Empty or unreadable resume: {filename}")
+    return parse_resume_text(filename, text, jd_text, scorer)
+
+
+# ==== METRICS ====
+
+class LatencyTracker:
+    def __init__(self):
+        self.samples = defaultdict(lambda: deque(maxlen=LATENCY_SAMPLES))
+        self.counts = defaultdict(int)
+        self.errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, failed):
+        self.samples[endpoint].append(seconds)
+        self.counts[endpoint] += 1
+        if failed:
+            self.errors[endpoint] += 1
+
+    def summary(self):
+        out = {}
+        for endpoint, samples in self.samples.items():
+            ordered = sorted(samples)
+            pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+            out[endpoint] = {
+                "requests": self.counts[endpoint],
+                "errors": self.errors[endpoint],
+                "mean_ms": round(1000 * sum(ordered) / len(ordered), 1),
+                "p50_ms": round(1000 * pick(0.50), 1),
+                "p95_ms": round(1000 * pick(0.95), 1),
+                "max_ms": round(1000 * ordered[-1], 1),
+            }
+        return out
+
+
+@web.middleware
+async def latency_middleware(request, handler):
+    start = time.perf_counter()
+    failed = True
+    try:
+        response = await handler(request)
+        failed = response.status >= 400
+        return response
+    finally:
+        route = request.match_info.route.resource
+        endpoint = f"{request.method} {route.canonical if route else request.path}"
+        request.app["latency"].record(endpoint, time.perf_counter() - start, failed)
+
+
+# ==== HELPERS ====
+
+async def _read_form(request):
+    """Return (jd_text, [(filename, bytes), ...]) from a multipart upload."""
+    form = await request.post()
+    jd_text = form.get("jd_text", "")
+    files = []
+    for field, value in form.items():
+        if not isinstance(value, web.FileField):
+            continue
+        data = value.file.read()
+        if field == "jd":
+            loop = asyncio.get_running_loop()
+            jd_text = await loop.run_in_executor(request.app["pool"], _jd_in_worker, value.filename, data)
+        else:
+            files.append((value.filename, data))
+    return jd_text, files
+
+
+def _evict_jobs(jobs, now=None):
+    """Drop finished jobs past their TTL, then the oldest beyond MAX_FINISHED_JOBS; running jobs stay."""
+    now = now or time.time()
+    finished = sorted((j for j in jobs.values() if j["status"] == "finished"), key=lambda j: j["finished_at"])
+    expired = [j for j in finished if now - j["finished_at"] > JOB_TTL_SECONDS]
+    kept = finished[len(expired):]
+    for job in expired + kept[:max(0, len(kept) - MAX_FINISHED_JOBS)]:
+        del jobs[job["id"]]
+
+
+async def _run_parse(request, filename, data, jd_text):
+    loop = asyncio.get_running_loop()
+    scorer = request.app["profile"].current()  # picks up edits to the profile file
+    return await loop.run_in_executor(request.app["pool"], _parse_in_worker, filename, data, jd_text, scorer)
+
+
+# ==== HANDLERS ====
+
+async def health(request):
+    return web.json_response({"status": "ok", "workers": request.app["workers"]})
+
+
+async def metrics(request):
+    jobs = request.app["jobs"]
+    return web.json_response({
+        "latency": request.app["latency"].summary(),
+        "jobs_running": sum(1 for j in jobs.values() if j["status"] == "running"),
+        "jobs_total": len(jobs),
+        "scoring_profile": request.app["profile"].current().name,
+        "scoring_profile_version": request.app["profile"].version,
+    })
+
+
+async def parse_resume(request):
+    """POST /parse - one resume (multipart field `resume`, or raw body with ?filename=)."""
+    if request.content_type.startswith("multipart/"):
+        jd_text, files = await _read_form(request)
+    else:
+        filename = request.query.get("filename", "")
+        files, jd_text = [(filename, await request.read())], ""
+    if len(files) != 1:
+        raise web.HTTPBadRequest(text="Upload exactly one resume")
+    try:
+        record = await _run_parse(request, files[0][0], files[0][1], jd_text)
+    except ValueError as e:
+        raise web.HTTPUnprocessableEntity(text=str(e))
+    return web.json_response(record)
+
+
+async def score_resume(request):
+    """POST /score - one resume plus a JD (`jd` file or `jd_text` field)."""
+    jd_text, files = await _read_form(request)
+    if not jd_text.strip():
+        raise web.HTTPBadRequest(text="A job description is required (jd or jd_text)")
+    if len(files) != 1:
+        raise web.HTTPBadRequest(text="Upload exactly one resume")
+    try:
+        record = await _run_parse(request, files[0][0], files[0][1], jd_text)
+    except ValueError as e:
+        raise web.HTTPUnprocessableEntity(text=str(e))
+    return web.json_response(record)
+
+
+async def _run_batch(app, job, files, jd_text):
+    loop = asyncio.get_running_loop()
+    scorer = app["profile"].current()  # one profile for the whole batch
+    futures = [loop.run_in_executor(app["pool"], _parse_in_worker, name, data, jd_text, scorer)
+               for name, data in files]
+    for name, future in zip([n for n, _ in files], futures):
+        try:
+            job["results"].append(await future)
+        except Exception as e:
+            job["errors"].append({"Filename": name, "error": str(e)})
+        job["done"] += 1
+    job["results"].sort(key=lambda r: r["Final_Score"], reverse=True)
+    job["status"] = "finished"
+    job["finished_at"] = time.time()
+    _evict_jobs(app["jobs"])
+
+
+async def submit_batch(request):
+    """POST /batch - JD plus many resumes; returns a job id to poll."""
+    jd_text, files = await _read_form(request)
+    if not files:
+        raise web.HTTPBadRequest(text="No resumes uploaded")
+    job_id = uuid.uuid4().hex
+    job = {"id": job_id, "status": "running", "total": len(files), "done": 0,
+           "results": [], "errors": [], "submitted_at": time.time(), "finished_at": None}
+    request.app["jobs"][job_id] = job
+    task = asyncio.create_task(_run_batch(request.app, job, files, jd_text))
+    request.app["tasks"].add(task)
+    task.add_done_callback(request.app["tasks"].discard)
+    return web.json_response({"job_id": job_id, "total": len(files)}, status=202)
+
+
+async def batch_status(request):
+    _evict_jobs(request.app["jobs"])
+    job = request.app["jobs"].get(request.match_info["job_id"])
+    if job is None:
+        raise web.HTTPNotFound(text="Unknown or expired job id")
+    if job["status"] == "running":
+        # Only the progress while running; results come back once the job finishes
+        return web.json_response({k: job[k] for k in ("id", "status", "total", "done", "submitted_at")})
+    return web.json_response(job)
+
+
+# ==== APP ====
+
+async def _start_pool(app):
+    pool = ProcessPoolExecutor(max_workers=app["workers"], initializer=_warm_worker)
+    # Submit one no-op per worker so every process is spawned and warm before serving
+    loop = asyncio.get_running_loop()
+    await asyncio.gather(*[loop.run_in_executor(pool, time.sleep, 0) for _ in range(app["workers"])])
+    app["pool"] = pool
+
+
+async def _stop_pool(app):
+    for task in list(app["tasks"]):
+        task.cancel()
+    app["pool"].shutdown(wait=False, cancel_futures=True)
+
+
+def create_app(workers=2, profile=None):
+    app = web.Application(middlewares=[latency_middleware], client_max_size=MAX_UPLOAD_BYTES)
+    app["workers"] = workers
+    app["profile"] = ProfileLoader(profile)
+    app["latency"] = LatencyTracker()
+    app["jobs"] = {}
+    app["tasks"] = set()
+    app.on_startup.append(_start_pool)
+    app.on_cleanup.append(_stop_pool)
+    app.add_routes([
+        web.get("/health", health),
+        web.get("/metrics", metrics),
+        web.post("/parse", parse_resume),
+        web.post("/score", score_resume),
+        web.post("/batch", submit_batch),
+        web.get("/batch/{job_id}", batch_status),
+    ])
+    return app
+
+
+def run_server(host="127.0.0.1", port=8080, workers=2, profile=None):
+    web.run_app(create_app(workers, profile), host=host, port=port)
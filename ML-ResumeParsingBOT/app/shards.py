@@ -0,0 +1,269 @@
+# app/shards.py
+# Sharded batch processing across machines through a shared directory (NFS,
+# SMB, a synced volume...), without a message broker:
+#
+#     <queue>/job.json             JD text + scoring profile every worker uses
+#     <queue>/manifests/NNNNN.json files of one shard (name + absolute path)
+#     <queue>/claims/NNNNN.lock    which worker holds a shard; mtime = heartbeat
+#     <queue>/done/NNNNN.jsonl     the shard's parsed records
+#
+# split() writes the manifests, work() runs on any number of nodes and claims
+# shards until none are left, and merge() builds the final ranked report.
+# Claims are created with O_EXCL, outputs are written to a temp file and renamed
+# in, and a claim whose heartbeat stops (a dead node) is taken over after
+# `lease` seconds. Even if two workers end up running the same shard, it has one
+# output file and merge() keeps one record per manifest file, so every resume is
+# counted exactly once.
+import json
+import os
+import socket
+import threading
+import time
+
+from app.parser import _resume_sources
+
+LEASE_SECONDS = 300  # a claim not refreshed for this long belongs to a dead worker
+
+
+def _write_json(path, data):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class ShardQueue:
+    """One sharded job in `folder`; see the module comment for the layout."""
+
+    def __init__(self, folder, lease=LEASE_SECONDS):
+        self.folder = folder
+        self.lease = lease
+        self.manifests = os.path.join(folder, "manifests")
+        self.claims = os.path.join(folder, "claims")
+        self.done = os.path.join(folder, "done")
+
+    def _manifest(self, shard):
+        return os.path.join(self.manifests, shard + ".json")
+
+    def _claim(self, shard):
+        return os.path.join(self.claims, shard + ".lock")
+
+    def _output(self, shard):
+        return os.path.join(self.done, shard + ".jsonl")
+
+    def shards(self):
+        return sorted(f[:-5] for f in os.listdir(self.manifests) if f.endswith(".json"))
+
+    def load_job(self):
+        with open(os.path.join(self.folder, "job.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_manifest(self, shard):
+        with open(self._manifest(shard), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ==== COORDINATOR ====
+
+    def split(self, source, jd_text, shard_size=200, profile=None):
+        """
+        Write one manifest per `shard_size` resumes of the folder `source`. Paths
+        are stored absolute, so every node needs the folder at the same path.
+        Returns the number of shards.
+        """
+        if os.path.exists(os.path.join(self.folder, "job.json")):
+            raise FileExistsError(f"{self.folder} already holds a sharded job")
+        for d in (self.manifests, self.claims, self.done):
+            os.makedirs(d, exist_ok=True)
+        # Only names and paths: the coordinator never reads the resumes themselves
+        files = [{"filename": name, "path": os.path.abspath(path)} for name, path in _resume_sources(source)]
+        shard_size = max(1, shard_size)
+        count = 0
+        for count, start in enumerate(range(0, len(files), shard_size), 1):
+            _write_json(self._manifest(f"{count:05d}"), files[start:start + shard_size])
+        # job.json last: workers wait for it, so they never see half the manifests
+        _write_json(os.path.join(self.folder, "job.json"),
+                    {"jd_text": jd_text, "profile": profile, "files": len(files), "shards": count})
+        return count
+
+    # ==== WORKERS ====
+
+    def claim(self, worker_id):
+        """Claim the next shard that is neither done nor held by a live worker; None when there is none."""
+        for shard in self.shards():
+            if os.path.exists(self._output(shard)):
+                continue
+            if self._try_claim(shard, worker_id):
+                # The previous holder may have finished between our two checks
+                if os.path.exists(self._output(shard)):
+                    self.release(shard)
+                    continue
+                return shard
+        return None
+
+    def _try_claim(self, shard, worker_id):
+        path = self._claim(shard)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                stale = time.time() - os.stat(path).st_mtime > self.lease
+            except FileNotFoundError:
+                stale = False  # released just now; picked up on the next pass
+            if not stale:
+                return False
+            # Move the dead claim aside; only one worker's rename can succeed
+            moved = f"{path}.{worker_id}.stale"
+            try:
+                os.replace(path, moved)
+            except FileNotFoundError:
+                return False
+            if time.time() - os.stat(moved).st_mtime <= self.lease:
+                # Another worker took it over between our stat and rename: hand the claim back
+                try:
+                    os.link(moved, path)
+                except FileExistsError:
+                    pass
+                os.remove(moved)
+                return False
+            os.remove(moved)
+            print(f"Taking over stale shard {shard}")
+            return self._try_claim(shard, worker_id)
+        with os.fdopen(fd, "w") as f:
+            f.write(f"{worker_id} {time.time():.0f}\n")
+        return True
+
+    def heartbeat(self, shard):
+        try:
+            os.utime(self._claim(shard))
+        except FileNotFoundError:
+            pass
+
+    def release(self, shard):
+        try:
+            os.remove(self._claim(shard))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, shard, records):
+        """Publish a shard's records in one rename, then drop the claim."""
+        tmp_path = f"{self._output(shard)}.{socket.gethostname()}-{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in records:
+                f.write(json.dumps(record, default=str) + "\n")
+        os.replace(tmp_path, self._output(shard))
+        self.release(shard)
+
+    def status(self):
+        shards = self.shards()
+        done = sum(os.path.exists(self._output(s)) for s in shards)
+        claimed = sum(os.path.exists(self._claim(s)) and not os.path.exists(self._output(s)) for s in shards)
+        return {"shards": len(shards), "done": done, "claimed": claimed, "pending": len(shards) - done - claimed}
+
+    # ==== MERGE ====
+
+    def iter_outputs(self):
+        for shard in self.shards():
+            if os.path.exists(self._output(shard)):
+                with open(self._output(shard), "r", encoding="utf-8") as f:
+                    yield shard, [json.loads(line) for line in f if line.strip()]
+
+
+def _keep_alive(queue, shard, stop):
+    while not stop.wait(queue.lease / 3):
+        queue.heartbeat(shard)
+
+
+def work(folder, workers=1, cache_dir=None, worker_id=None, wait=0.0):
+    """
+    Process shards from the queue in `folder` until none are left. With `wait`,
+    keep polling that many seconds for the job to appear and for shards held by
+    other workers. Returns how many shards this worker completed.
+    """
+    from app.engine import Engine
+    from app.scoring import Scorer
+
+    queue = ShardQueue(folder)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    deadline = time.monotonic() + wait
+    while not os.path.exists(os.path.join(folder, "job.json")):
+        if time.monotonic() >= deadline:
+            raise FileNotFoundError(f"No sharded job in {folder} (run shard-split first)")
+        time.sleep(1.0)
+    job = queue.load_job()
+    scorer = Scorer(job["profile"]) if job["profile"] else None
+    # Near-duplicates are only grouped within a shard; merge() catches repeat email/phone across shards
+    engine = Engine(job["jd_text"], workers=workers, cache_dir=cache_dir, scorer=scorer)
+
+    completed = 0
+    while True:
+        shard = queue.claim(worker_id)
+        if shard is None:
+            status = queue.status()
+            if status["claimed"] and time.monotonic() < deadline:
+                time.sleep(min(5.0, queue.lease / 3))  # a stale claim may still come free
+                continue
+            return completed
+        files = queue.load_manifest(shard)
+        print(f"[{worker_id}] shard {shard}: {len(files)} resumes")
+        stop = threading.Event()
+        threading.Thread(target=_keep_alive, args=(queue, shard, stop), daemon=True).start()
+        try:
+            records = list(engine.iter_records([(f["filename"], f["path"]) for f in files]))
+        except Exception:
+            queue.release(shard)  # let another worker retry it
+            raise
+        finally:
+            stop.set()
+        queue.complete(shard, records)
+        completed += 1
+
+
+def merge(folder, output_file):
+    """
+    Combine every finished shard into one ranked report, one record per file
+    in the manifests. Returns (DataFrame, BatchStats, files with no record).
+    """
+    import pandas as pd
+    from app.dedupe import contact_keys
+    from app.output import write_records
+    from app.stats import BatchStats
+
+    queue = ShardQueue(folder)
+    expected = {}  # filename -> shard, from the manifests (not from whatever the outputs hold)
+    for shard in queue.shards():
+        for f in queue.load_manifest(shard):
+            expected[f["filename"]] = shard
+
+    by_file = {}
+    for shard, records in queue.iter_outputs():
+        for record in records:
+            if expected.get(record["Filename"]) == shard:
+                by_file.setdefault(record["Filename"], record)
+
+    # Same candidate in two shards: keep the first, list the rest as duplicates
+    records, owner = [], {}
+    for filename in sorted(by_file):
+        record = by_file[filename]
+        keys = contact_keys(record.get("Email", ""), str(record.get("Phone", "")))
+        first = next((owner[k] for k in keys if k in owner), None)
+        if first is not None:
+            kept = records[first]
+            extra = [f for f in [record["Filename"]] + str(record.get("DuplicateFiles") or "").split(", ") if f]
+            kept["DuplicateFiles"] = ", ".join(f for f in [kept.get("DuplicateFiles")] + extra if f)
+            continue
+        for key in keys:
+            owner[key] = len(records)
+        records.append(record)
+
+    # Files grouped as duplicates inside a shard have no record of their own
+    covered = set(by_file)
+    for record in records:
+        covered.update(f for f in str(record.get("DuplicateFiles") or "").split(", ") if f)
+    missing = sorted(set(expected) - covered)
+
+    df = pd.DataFrame(records)
+    if len(df):
+        df = df.sort_values("Final_Score", ascending=False)
+    write_records(df, output_file)
+    stats = BatchStats.from_records(records)
+    return df, stats, missing
@@ -0,0 +1,197 @@
+# app/stats.py
+# Running statistics over scored candidates: counts per status, a score
+# histogram for quantiles and skill frequencies. Updated one record at a time as
+# the pipeline produces them, and mergeable, so parallel workers, separate
+# batches or several machines can each keep their own and combine them later.
+#
+# Skill frequencies only count skills from the fixed taxonomy in app.utils. The
+# free-text skills that noun-chunk mining adds are left out, so the counters
+# stay bounded by the taxonomy size however long a batch or watcher runs, and
+# stay exact (remove() and merge() need that).
+import json
+import math
+from collections import Counter
+
+from app.utils import SOFT_SKILLS, TECH_SKILLS
+
+BIN_WIDTH = 0.5  # score histogram resolution; quantiles are accurate to this
+
+
+def _skills(value):
+    if not isinstance(value, str):
+        return []
+    return [s.strip() for s in value.split(",") if s.strip()]
+
+
+_TAXONOMY = frozenset(s.lower() for s in TECH_SKILLS + SOFT_SKILLS)
+
+
+def _taxonomy_skills(value):
+    """Skills of a comma-joined column that are in the taxonomy; mined free-text skills are not counted."""
+    return [s for s in _skills(value) if s.lower() in _TAXONOMY]
+
+
+def _taxonomy_counter(counts):
+    return Counter({s: n for s, n in counts.items() if s.lower() in _TAXONOMY})
+
+
+class BatchStats:
+    def __init__(self, bin_width=BIN_WIDTH):
+        self.bin_width = bin_width
+        self.count = 0
+        self.score_sum = 0.0
+        self.min_score = None
+        self.max_score = None
+        self.status_counts = Counter()
+        self.histogram = Counter()  # bin index -> candidates whose score falls in it
+        self.tech_skills = Counter()  # taxonomy skill -> candidates with it
+        self.soft_skills = Counter()
+
+    # ==== UPDATES ====
+
+    def _bin(self, score):
+        return int(math.floor(score / self.bin_width))
+
+    def add(self, record):
+        score = float(record.get("Final_Score", 0) or 0)
+        self.count += 1
+        self.score_sum += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.status_counts[str(record.get("Status", ""))] += 1
+        self.histogram[self._bin(score)] += 1
+        self.tech_skills.update(_taxonomy_skills(record.get("TechSkills")))
+        self.soft_skills.update(_taxonomy_skills(record.get("SoftSkills")))
+        return self
+
+    def remove(self, record):
+        """Undo add() for a record that has been replaced (e.g. a re-parsed file)."""
+        score = float(record.get("Final_Score", 0) or 0)
+        self.count -= 1
+        self.score_sum -= score
+        self.status_counts.subtract([str(record.get("Status", ""))])
+        self.histogram.subtract([self._bin(score)])
+        self.tech_skills.subtract(_taxonomy_skills(record.get("TechSkills")))
+        self.soft_skills.subtract(_taxonomy_skills(record.get("SoftSkills")))
+        for counter in (self.status_counts, self.histogram, self.tech_skills, self.soft_skills):
+            counter += Counter()  # drops the zero entries in place
+        # min/max cannot be un-merged; narrow them back from the histogram
+        if self.histogram:
+            self.min_score = max(self.min_score, min(self.histogram) * self.bin_width)
+            self.max_score = min(self.max_score, (max(self.histogram) + 1) * self.bin_width)
+        else:
+            self.min_score = self.max_score = None
+        return self
+
+    def merge(self, other):
+        if other.bin_width != self.bin_width:
+            raise ValueError("Cannot merge stats with different histogram bin widths")
+        self.count += other.count
+        self.score_sum += other.score_sum
+        for attr, pick in (("min_score", min), ("max_score", max)):
+            values = [v for v in (getattr(self, attr), getattr(other, attr)) if v is not None]
+            setattr(self, attr, pick(values) if values else None)
+        self.status_counts.update(other.status_counts)
+        self.histogram.update(other.histogram)
+        self.tech_skills.update(other.tech_skills)
+        self.soft_skills.update(other.soft_skills)
+        return self
+
+    @classmethod
+    def from_records(cls, records):
+        stats = cls()
+        for record in records:
+            stats.add(record)
+        return stats
+
+    # ==== QUERIES ====
+
+    def quantile(self, q):
+        """Score below which a fraction `q` of candidates fall, from the histogram."""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for b in sorted(self.histogram):
+            n = self.histogram[b]
+            if seen + n >= target:
+                # Interpolate inside the bin, clamped to the real score range
+                value = (b + (target - seen) / n) * self.bin_width
+                return round(min(max(value, self.min_score), self.max_score), 2)
+            seen += n
+        return self.max_score
+
+    def suggest_thresholds(self, shortlist_pct=0.2, review_pct=0.5):
+        """
+        Cut-offs that shortlist the top `shortlist_pct` of this batch and send the
+        next slice up to `review_pct` to review, in place of the fixed 70 / 45.
+        """
+        return {"shortlist": self.quantile(1 - shortlist_pct),
+                "review": self.quantile(1 - review_pct)}
+
+    def top_skills(self, k=10):
+        return self.tech_skills.most_common(k), self.soft_skills.most_common(k)
+
+    def summary(self, k=10, shortlist_pct=0.2, review_pct=0.5):
+        tech, soft = self.top_skills(k)
+        return {
+            "candidates": self.count,
+            "status_counts": dict(self.status_counts),
+            "score_mean": round(self.score_sum / self.count, 2) if self.count else None,
+            "score_min": self.min_score,
+            "score_max": self.max_score,
+            "score_quantiles": {f"p{int(q * 100)}": self.quantile(q) for q in (0.25, 0.5, 0.75, 0.9)},
+            "suggested_thresholds": self.suggest_thresholds(shortlist_pct, review_pct),
+            "top_tech_skills": tech,
+            "top_soft_skills": soft,
+        }
+
+    # ==== PERSISTENCE ====
+
+    def to_dict(self):
+        return {
+            "bin_width": self.bin_width,
+            "count": self.count,
+            "score_sum": self.score_sum,
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "status_counts": dict(self.status_counts),
+            "histogram": {str(b): n for b, n in self.histogram.items()},
+            "tech_skills": dict(self.tech_skills),
+            "soft_skills": dict(self.soft_skills),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls(data.get("bin_width", BIN_WIDTH))
+        stats.count = data["count"]
+        stats.score_sum = data["score_sum"]
+        stats.min_score = data["min_score"]
+        stats.max_score = data["max_score"]
+        stats.status_counts = Counter(data["status_counts"])
+        stats.histogram = Counter({int(b): n for b, n in data["histogram"].items()})
+        # Files saved before skills were limited to the taxonomy may hold mined ones
+        stats.tech_skills = _taxonomy_counter(data["tech_skills"])
+        stats.soft_skills = _taxonomy_counter(data["soft_skills"])
+        return stats
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def print_summary(summary):
+    print(f"Candidates: {summary['candidates']}  (mean score {summary['score_mean']}, "
+          f"range {summary['score_min']}-{summary['score_max']})")
+    for status, n in sorted(summary["status_counts"].items()):
+        print(f"  {status}: {n}")
+    print("Score quantiles: " + ", ".join(f"{k}={v}" for k, v in summary["score_quantiles"].items()))
+    t = summary["suggested_thresholds"]
+    print(f"Suggested thresholds: shortlist > {t['shortlist']}, review > {t['review']}")
+    print("Top tech skills: " + ", ".join(f"{s} ({n})" for s, n in summary["top_tech_skills"]))
+    print("Top soft skills: " + ", ".join(f"{s} ({n})" for s, n in summary["top_soft_skills"]))
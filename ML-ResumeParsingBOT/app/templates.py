@@ -0,0 +1,151 @@
+# app/templates.py
+# Candidate email templates. Each template is parsed once into literal text and
+# field names, so rendering a whole batch is only string joins.
+#
+# A template folder holds one file per status (shortlisted.txt, rejected.txt,
+# to_be_reviewed.txt, ...) and optionally a sub-folder per JD with overrides:
+#
+#     Subject: You've Been Shortlisted for $role
+#
+#     Dear $name, ...
+#
+# Fields: $name, $email, $status, $score, $role, $company, $filename.
+# Only statuses that have a template get an email.
+import os
+from email.mime.text import MIMEText
+from string import Template
+
+DEFAULT_COMPANY = "Accenture"
+# Every $field a template may use: candidate_fields() plus the TemplateSet defaults
+FIELDS = ("name", "email", "status", "score", "role", "company", "filename")
+
+# Same wording the emailer always sent
+DEFAULT_TEMPLATES = {
+    "Shortlisted": ("You’ve Been Shortlisted",
+                    "Dear $name,\n\nYou are shortlisted for the role.\n\n- $company"),
+    "Rejected": ("Application Update",
+                 "Dear $name,\n\nWe won’t be proceeding further.\n\n- $company"),
+}
+
+
+class CompiledTemplate:
+    """A $field template split into alternating literal / field parts up front."""
+
+    def __init__(self, source):
+        self.parts = []  # (literal, field name or None)
+        pos = 0
+        for match in Template.pattern.finditer(source):
+            literal = source[pos:match.start()]
+            if match.group("escaped") is not None:
+                self.parts.append((literal + "$", None))
+            elif match.group("invalid") is not None:
+                raise ValueError(f"Invalid placeholder in template at position {match.start()}")
+            else:
+                self.parts.append((literal, match.group("named") or match.group("braced")))
+            pos = match.end()
+        self.parts.append((source[pos:], None))
+        self.fields = {field for _, field in self.parts if field is not None}
+
+    def render(self, fields):
+        out = []
+        for literal, field in self.parts:
+            out.append(literal)
+            if field is not None:
+                out.append(str(fields.get(field, "")))
+        return "".join(out)
+
+
+def _status_key(status):
+    return status.strip().lower().replace(" ", "_")
+
+
+def _compile(subject, body):
+    """(subject, body) CompiledTemplates; ValueError if either uses a field not in FIELDS."""
+    compiled = (CompiledTemplate(subject), CompiledTemplate(body))
+    # A typo'd field would otherwise render as "" in every email sent
+    unknown = (compiled[0].fields | compiled[1].fields) - set(FIELDS)
+    if unknown:
+        raise ValueError(f"unknown field(s) {', '.join('$' + f for f in sorted(unknown))} "
+                         f"(known: {', '.join('$' + f for f in FIELDS)})")
+    return compiled
+
+
+def _read_template(path):
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    first, _, body = text.partition("\n")
+    if not first.lower().startswith("subject:"):
+        raise ValueError(f"{path}: first line must be 'Subject: ...'")
+    return first.split(":", 1)[1].strip(), body.lstrip("\n")
+
+
+class TemplateSet:
+    """Compiled subject/body templates per status, plus the fixed fields (role, company)."""
+
+    def __init__(self, templates=None, company=DEFAULT_COMPANY, role="the role"):
+        templates = DEFAULT_TEMPLATES if templates is None else templates
+        self.templates = {}
+        for status, (subject, body) in templates.items():
+            try:
+                self.templates[_status_key(status)] = _compile(subject, body)
+            except ValueError as e:
+                raise ValueError(f"Template '{status}': {e}") from None
+        self.defaults = {"company": company, "role": role}
+
+    @classmethod
+    def from_folder(cls, folder, jd=None, **fields):
+        """Load `folder/<status>.txt`, overridden by `folder/<jd>/<status>.txt` when `jd` is given."""
+        templates = {}
+        for directory in [folder] + ([os.path.join(folder, jd)] if jd else []):
+            if not os.path.isdir(directory):
+                raise FileNotFoundError(f"Template folder not found: {directory}")
+            for filename in sorted(os.listdir(directory)):
+                if filename.endswith(".txt"):
+                    path = os.path.join(directory, filename)
+                    subject, body = _read_template(path)
+                    try:
+                        _compile(subject, body)  # fail on the file with the typo, not later
+                    except ValueError as e:
+                        raise ValueError(f"{path}: {e}") from None
+                    templates[filename[:-4]] = (subject, body)
+        return cls(templates, **fields)
+
+    def handles(self, status):
+        return _status_key(status) in self.templates
+
+    def render(self, status, fields):
+        """(subject, body) for one candidate, or None when the status has no template."""
+        compiled = self.templates.get(_status_key(status))
+        if compiled is None:
+            return None
+        fields = {**self.defaults, **fields}
+        return compiled[0].render(fields), compiled[1].render(fields)
+
+
+def render_message(templates, fields, sender):
+    """Build the ready-to-send message for one candidate (fields from candidate_fields)."""
+    rendered = templates.render(fields["status"], fields)
+    if rendered is None:
+        return None
+    subject, body = rendered
+    msg = MIMEText(body)
+    msg['Subject'] = subject
+    msg['From'] = sender or ""
+    msg['To'] = fields["email"]
+    return msg
+
+
+def render_messages(templates, recipients, sender):
+    """render_message over a chunk of candidates, so a process pool gets one task per chunk."""
+    return [render_message(templates, fields, sender) for fields in recipients]
+
+
+def candidate_fields(row):
+    name = row.get("Name")
+    return {
+        "name": name if isinstance(name, str) and name.strip() else "Candidate",
+        "email": str(row.get("Email", "")).strip(),
+        "status": str(row.get("Status", "")).strip(),
+        "score": row.get("Final_Score", ""),
+        "filename": row.get("Filename", ""),
+    }
@@ -1,7 +1,13 @@
+import io
 import os
 import re
+import unicodedata
+from collections import namedtuple
+from datetime import date
+from functools import lru_cache
 import pdfplumber
-import docx
+import zipfile
+import xml.etree.ElementTree as ET
 import pandas as pd
 from sklearn.feature_extraction.text import TfidfVectorizer
 import spacy
@@ -16,69 +22,397 @@ except OSError:
 
 
 # ==== TEXT EXTRACTION ====
-
-def extract_text_from_pdf(file_path):
-    with pdfplumber.open(file_path) as pdf:
-        # Using .clean_text() can help with some formatting issues
-        return "\n".join([page.extract_text(keep_empty_lines=False) or "" for page in pdf.pages])
-
-def extract_text_from_docx(file_path):
-    doc = docx.Document(file_path)
-    return "\n".join([para.text for para in doc.paragraphs])
+# Every extractor takes a path, raw bytes or a binary file-like object (e.g. a
+# Streamlit UploadedFile), so uploads can be parsed without touching disk.
+
+def _open_source(source):
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return io.BytesIO(source)
+    if hasattr(source, 'seek'):
+        source.seek(0) # Uploaded files may already have been read once
+    return source
+
+def _source_name(source, filename=None):
+    name = filename or getattr(source, 'name', None)
+    if name is None:
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            raise ValueError("A filename is required to parse raw bytes") # never echo the payload
+        name = str(source)
+    return os.fspath(name)
+
+def iter_pdf_pages(source):
+    """
+    Yield the text of each PDF page in order. Each page's layout objects (chars,
+    lines, rects) are released as soon as its text is taken, so memory stays flat
+    however many pages the document has.
+    """
+    with pdfplumber.open(_open_source(source)) as pdf:
+        for page in pdf.pages:
+            try:
+                # Using .clean_text() can help with some formatting issues
+                yield page.extract_text(keep_empty_lines=False) or ""
+            finally:
+                page.close() # pdfplumber caches layout objects per page until closed
+
+def extract_text_from_pdf(source):
+    return "\n".join(iter_pdf_pages(source))
+
+# WordprocessingML names, as ElementTree spells them
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_DOCX_PART = re.compile(r'^word/(header|footer)(\d*)\.xml$')
+
+
+def _iter_docx_part(part):
+    """
+    Paragraph texts of one DOCX XML part in document order, parsed incrementally.
+    Each table row comes out as one line with its cells joined by ' | ' (keeps
+    "Languages | Python, SQL" together); text boxes come out where they are
+    anchored. Finished paragraphs are cleared so memory does not grow with the
+    document.
+    """
+    paragraphs = []  # text of the paragraphs currently open (text boxes nest them)
+    rows = []        # cells of the table rows currently open (tables nest too)
+    cells = []       # paragraphs of the table cells currently open
+    skip = 0         # inside <mc:Fallback>, a duplicate rendering of a text box
+    runs = 0         # open <w:r> runs; <w:tab> outside one is a tab stop in <w:pPr>, not text
+    for event, elem in ET.iterparse(part, events=("start", "end")):
+        tag = elem.tag
+        if tag == _MC_FALLBACK:
+            skip += 1 if event == "start" else -1
+            continue
+        if skip:
+            continue
+        if event == "start":
+            if tag == _W + 'p':
+                paragraphs.append([])
+            elif tag == _W + 'tr':
+                rows.append([])
+            elif tag == _W + 'tc':
+                cells.append([])
+            elif tag == _W + 'r':
+                runs += 1
+            continue
+        if tag == _W + 'r':
+            runs -= 1
+            continue
+
+        line = None
+        if not paragraphs and tag not in (_W + 'tc', _W + 'tr'):
+            continue
+        if tag == _W + 't':
+            paragraphs[-1].append(elem.text or "")
+        elif tag == _W + 'tab' and runs:
+            paragraphs[-1].append("\t")
+        elif tag in (_W + 'br', _W + 'cr') and runs:
+            paragraphs[-1].append("\n")
+        elif tag == _W + 'p':
+            line = "".join(paragraphs.pop())
+            elem.clear()
+        elif tag == _W + 'tc' and cells:
+            text = " ".join(p for p in cells.pop() if p.strip())
+            if rows:
+                rows[-1].append(text)
+        elif tag == _W + 'tr' and rows:
+            line = " | ".join(c for c in rows.pop() if c)
+
+        if line is not None:
+            if cells:
+                cells[-1].append(line) # inside a table cell: part of the row's line
+            else:
+                yield line
+
+
+def iter_docx_paragraphs(source):
+    """
+    Yield every paragraph of a DOCX: headers first, then the body (including
+    tables and text boxes) in document order, then footers. Headers and footers
+    repeated across sections are only yielded once.
+    """
+    with zipfile.ZipFile(_open_source(source)) as z:
+        names = z.namelist()
+        parts = sorted((m.group(1), int(m.group(2) or 0), name)
+                       for name in names for m in [_DOCX_PART.match(name)] if m)
+        headers = [name for kind, _, name in parts if kind == "header"]
+        footers = [name for kind, _, name in parts if kind == "footer"]
+        seen = set()
+        for name in headers + ["word/document.xml"] + footers:
+            if name not in names:
+                continue
+            with z.open(name) as part:
+                if name == "word/document.xml":
+                    yield from _iter_docx_part(part)
+                    continue
+                paragraphs = list(_iter_docx_part(part))
+            key = tuple(paragraphs)
+            if any(p.strip() for p in paragraphs) and key not in seen:
+                seen.add(key)
+                yield from paragraphs
+
+def extract_text_from_docx(source):
+    return "\n".join(iter_docx_paragraphs(source))
+
+def extract_text(source, filename=None):
+    # Dispatch on extension; pass `filename` when `source` is bytes
+    name = _source_name(source, filename)
+    if name.lower().endswith('.pdf'):
+        return extract_text_from_pdf(source)
+    elif name.lower().endswith('.docx'):
+        return extract_text_from_docx(source)
+    raise ValueError(f"Unsupported resume format: {os.path.basename(name)}")
+
+def load_jd_text(source, filename=None):
+    ext = _source_name(source, filename).lower().split('.')[-1]
+    if ext == "pdf":
+        return extract_text_from_pdf(source)
+    elif ext == "docx":
+        return extract_text_from_docx(source)
+    elif ext == "txt":
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "r", encoding="utf-8") as f:
+                return f.read()
+        data = _open_source(source)
+        data = data.read() if hasattr(data, 'read') else data
+        return data.decode("utf-8", errors="ignore")
+    else:
+        raise ValueError("Unsupported JD format. Please use TXT, PDF, or DOCX.")
+
+# ==== COMPILED PATTERNS ====
+# Every fixed regex used by the extractors, compiled once at import instead of
+# being looked up in re's cache on every call.
+
+EMAIL_PATTERN = r'[\w\.-]+@[\w\.-]+\.\w+' # More specific email regex
+# Enhanced patterns for various international formats, including Indian numbers (in priority order)
+PHONE_PATTERNS = [
+    r'(?:\+?(\d{1,3}))?[-. (]*(\d{3})[-. )]*(\d{3})[-. ]*(\d{4})(?: *x(\d+))?', # General international/US
+    r'(\+91[\-\s]?)?[6789]\d{9}', # Indian mobile numbers
+    r'\b\d{5}[-.\s]?\d{5}\b' # Common 10-digit without country code (e.g., 12345 67890)
+]
+GITHUB_PATTERN = r'github\.com/[\w\-\.]+' # More specific for usernames
+LINKEDIN_PATTERN = r'linkedin\.com/in/[\w\-\.]+' # More specific for profile URLs
+
+# Two dates joined by a dash / "to", or a date and "present"; each date is
+# "Jun 2019", "06/2019" or a bare year
+_MONTH_NAMES = (r'jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+                r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?')
+_DATE = (r'(?:(?P<{p}mon>' + _MONTH_NAMES + r')(?![a-z])\.?,?\s*'
+         r'|(?P<{p}num>0?[1-9]|1[0-2])\s*[/.-]\s*)?(?P<{p}year>(?:19|20)\d{{2}})')
+DATE_RANGE_PATTERN = (r'\b' + _DATE.format(p='s') + r'\s*(?:-|–|—|to|till|until)\s*(?:' + _DATE.format(p='e')
+                      + r'|(?P<present>present|current|now|ongoing|till date|date))\b')
+
+PATTERNS = {
+    'email': re.compile(EMAIL_PATTERN),
+    'phone': [re.compile(p) for p in PHONE_PATTERNS],
+    'phone_cleanup': re.compile(r'[^\d+]'),
+    # IGNORECASE instead of lower-casing a copy of the whole document per call
+    'github': re.compile(GITHUB_PATTERN, re.IGNORECASE),
+    'linkedin': re.compile(LINKEDIN_PATTERN, re.IGNORECASE),
+    'digit': re.compile(r'\d'),
+    'name_line_reject': re.compile(r'@|resume|cv|skills|experience|education|projects', re.IGNORECASE),
+    'years_of_experience': re.compile(r'(\d+(\.\d+)?)\s*years?\s*of\s*experience', re.IGNORECASE),
+    'duration': re.compile(r'(?:(\d+)\s*years?|(\d+)\s*months?)', re.IGNORECASE),
+    'date_range': re.compile(DATE_RANGE_PATTERN, re.IGNORECASE),
+    'job_title': re.compile(r'\b(manager|engineer|developer|analyst|specialist|lead|architect|director)\b', re.IGNORECASE),
+    'gpa': re.compile(r'(\d(?:\.\d{1,2})?)\s*(?:/|\s*out\s*of)\s*(?:10(?:\.0)?|4(?:\.0)?)'),
+    'percent': re.compile(r'(\d{2,3}(?:\.\d{1,2})?)\s*%'),
+    'cgpa': re.compile(r'CGPA[:\s]*(\d(?:\.\d{1,2})?)'),
+}
+
+# ==== NORMALIZED VIEW ====
+
+class ResumeText:
+    """
+    One resume's text, normalized once and shared by every extractor below:
+    NFKC-normalized text (ligatures, full-width characters, non-breaking
+    spaces), its lower-cased copy at the same offsets, the header lines and
+    memoized sections. Every extractor also accepts a plain str and wraps it.
+    """
+
+    __slots__ = ("text", "lower", "_head_lines", "_sections")
+
+    def __init__(self, text):
+        if not text.isascii():
+            text = unicodedata.normalize("NFKC", text)
+        self.text = text
+        lower = text.lower()
+        if len(lower) != len(text):
+            # A few characters lower-case to two ('İ'); keep those as-is so offsets line up
+            lower = ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+        self.lower = lower
+        self._head_lines = None
+        self._sections = {}
+
+    def __len__(self):
+        return len(self.text)
+
+    def head_lines(self):
+        """The first NAME_HEADER_LINES lines of the stripped text."""
+        if self._head_lines is None:
+            self._head_lines = self.text.strip().split('\n', NAME_HEADER_LINES)[:NAME_HEADER_LINES]
+        return self._head_lines
+
+    def section(self, keywords, next_section_keywords=()):
+        key = (tuple(keywords), tuple(next_section_keywords))
+        if key not in self._sections:
+            self._sections[key] = _find_section(self, key[0], key[1])
+        return self._sections[key]
+
+
+def as_resume_text(text):
+    return text if isinstance(text, ResumeText) else ResumeText(text)
 
 # ==== BASIC INFO ====
 
 def extract_email(text):
-    match = re.search(r'[\w\.-]+@[\w\.-]+\.\w+', text) # More specific email regex
+    match = PATTERNS['email'].search(text)
     return match.group(0) if match else ""
 
 def extract_phone(text):
-    # Enhanced patterns for various international formats, including Indian numbers
-    patterns = [
-        r'(?:\+?(\d{1,3}))?[-. (]*(\d{3})[-. )]*(\d{3})[-. ]*(\d{4})(?: *x(\d+))?', # General international/US
-        r'(\+91[\-\s]?)?[6789]\d{9}', # Indian mobile numbers
-        r'\b\d{5}[-.\s]?\d{5}\b' # Common 10-digit without country code (e.g., 12345 67890)
-    ]
-    for pattern in patterns:
-        match = re.search(pattern, text)
+    for pattern in PATTERNS['phone']:
+        match = pattern.search(text)
         if match:
             # Clean up the phone number, remove spaces/dashes
-            return re.sub(r'[^\d+]', '', match.group(0))
+            return PATTERNS['phone_cleanup'].sub('', match.group(0))
     return ""
 
-def extract_name(text):
-    # Use spaCy for better name entity recognition
-    doc = nlp(text)
+def _has_link(text_lower, anchor, pattern):
+    # Cheap literal find, full pattern only where the anchor occurs
+    i = text_lower.find(anchor)
+    while i != -1:
+        if pattern.match(text_lower, i):
+            return True
+        i = text_lower.find(anchor, i + 1)
+    return False
+
+def scan_contact_info(text, text_lower=None):
+    """
+    Email, phone, GitHub and LinkedIn from one scan of the text (plus one shared
+    lower-cased copy, which callers that already have one can pass in).
+    Returns (email, phone, has_github, has_linkedin), same as the single extractors.
+
+    A single alternation regex over all four turned out ~10x slower than this:
+    it loses re's literal-prefix search and has to scan to the end for every field,
+    so the anchors ('@', 'github.com/', 'linkedin.com/in/') are located with
+    str.find and the full patterns only run where they occur.
+    """
+    if isinstance(text, ResumeText):
+        text, text_lower = text.text, text.lower
+    elif text_lower is None:
+        text_lower = text.lower()
+
+    email = ""
+    at = text.find('@')
+    while at != -1:
+        # Back up to the start of the local part, then match the full pattern there
+        start = at
+        while start > 0 and (text[start - 1].isalnum() or text[start - 1] in '_.-'):
+            start -= 1
+        match = PATTERNS['email'].match(text, start)
+        if match:
+            email = match.group(0)
+            break
+        at = text.find('@', at + 1)
+
+    return (email,
+            extract_phone(text),
+            _has_link(text_lower, 'github.com/', PATTERNS['github']),
+            _has_link(text_lower, 'linkedin.com/in/', PATTERNS['linkedin']))
+
+# Names are almost always in the first few lines, so NER runs on this window
+# first and only sees the whole resume when neither the window nor the
+# line heuristic finds one
+NAME_HEADER_LINES = 8
+NAME_HEADER_CHARS = 400
+
+# Only the entity recognizer is needed to find a PERSON
+_NER_DISABLE = [p for p in nlp.pipe_names if p not in ("tok2vec", "ner")]
+
+
+def _header_window(doc):
+    return '\n'.join(doc.head_lines())[:NAME_HEADER_CHARS]
+
+def _person_entity(text):
+    doc = nlp(text, disable=_NER_DISABLE)
     for ent in doc.ents:
         if ent.label_ == "PERSON":
-            # Heuristic: Often the first PERSON entity in the first few lines is the name.
             # Filter out short names or common single words.
-            if len(ent.text.split()) > 1 and len(ent.text.split()) <= 4 and not re.search(r'\d', ent.text):
+            if len(ent.text.split()) > 1 and len(ent.text.split()) <= 4 and not PATTERNS['digit'].search(ent.text):
                 return ent.text.strip()
-    # Fallback to previous logic if spaCy doesn't find a good name
-    for line in text.strip().split('\n')[:5]:
-        if line and not re.search(r'@|resume|cv|skills|experience|education|projects', line.lower()):
+    return ""
+
+def _name_line(doc):
+    for line in doc.head_lines()[:5]:
+        if line and not PATTERNS['name_line_reject'].search(line):
             if 1 < len(line.split()) <= 4: # Name usually 2-4 words
                 return line.strip()
     return ""
 
+def extract_name_with_source(text, ner=True, full_ner=True):
+    """
+    Returns (name, path) where path is the step that found it:
+    "header_ner", "header_line", "full_ner" or "none". With ner=False only the
+    line heuristic runs (no spaCy); full_ner=False never runs NER on the whole text.
+    """
+    doc = as_resume_text(text)
+    header = _header_window(doc)
+    name = _person_entity(header) if ner else ""
+    if name:
+        return name, "header_ner"
+    name = _name_line(doc)
+    if name:
+        return name, "header_line"
+    if ner and full_ner and len(header) < len(doc.text.strip()):
+        name = _person_entity(doc.text)
+        if name:
+            return name, "full_ner"
+    return "", "none"
+
+def extract_name(text, ner=True, full_ner=True):
+    return extract_name_with_source(text, ner, full_ner)[0]
+
 # ==== SOCIAL LINKS ====
 
 def has_github(text):
-    return bool(re.search(r'github\.com/[\w\-\.]+', text.lower())) # More specific for usernames
+    return _has_link(as_resume_text(text).lower, 'github.com/', PATTERNS['github'])
 
 def has_linkedin(text):
-    return bool(re.search(r'linkedin\.com/in/[\w\-\.]+', text.lower())) # More specific for profile URLs
+    return _has_link(as_resume_text(text).lower, 'linkedin.com/in/', PATTERNS['linkedin'])
 
 # ==== SECTION EXTRACTION ====
 
-# More robust section extraction using common headers and looking for patterns
-def extract_section(text, keywords, next_section_keywords=[]):
-    text_lower = text.lower()
+# Common section headers that mark the end of the current section
+# You can expand this list based on common resume formats
+SECTION_HEADINGS = [
+    "experience", "work experience", "professional experience",
+    "education", "academic background",
+    "projects", "academic projects", "personal projects",
+    "skills", "technical skills", "programming languages", "tool and technologies",
+    "achievements", "accomplishments", "awards", "honors",
+    "certifications", "licenses", "training",
+    "publications", "research",
+    "volunteer", "volunteering", "extracurricular activities",
+    "interests", "hobbies",
+    "summary", "objective", "about me"
+]
+
+
+@lru_cache(maxsize=None)
+def _section_start_pattern(keyword):
+    # Search for the keyword as a whole word or followed by non-alphanumeric
+    return re.compile(r'\b' + re.escape(keyword.lower()) + r'\b[^a-z]*\n')
+
+
+@lru_cache(maxsize=None)
+def _section_end_pattern(next_section_keywords):
+    # Common section headers plus the caller's, each as a line of its own
+    all_end_keywords = [re.escape(kw.lower()) for kw in (SECTION_HEADINGS + list(next_section_keywords))]
+    return re.compile(r'(\n[ \t]*(' + '|'.join(all_end_keywords) + r')[ \t]*\n)')
+
+
+def _find_section(doc, keywords, next_section_keywords):
     start_index = -1
     for kw in keywords:
-        # Search for the keyword as a whole word or followed by non-alphanumeric
-        match = re.search(r'\b' + re.escape(kw.lower()) + r'\b[^a-z]*\n', text_lower)
+        match = _section_start_pattern(kw).search(doc.lower)
         if match:
             start_index = match.end()
             break
@@ -86,152 +420,216 @@ def extract_section(text, keywords, next_section_keywords=[]):
     if start_index == -1:
         return "" # Changed from "NULL" to "" for consistency
 
-    # Define common section headers that would mark the end of the current section
-    # You can expand this list based on common resume formats
-    common_end_keywords = [
-        "experience", "work experience", "professional experience",
-        "education", "academic background",
-        "projects", "academic projects", "personal projects",
-        "skills", "technical skills", "programming languages", "tool and technologies",
-        "achievements", "accomplishments", "awards", "honors",
-        "certifications", "licenses", "training",
-        "publications", "research",
-        "volunteer", "volunteering", "extracurricular activities",
-        "interests", "hobbies",
-        "summary", "objective", "about me"
-    ]
-    # Combine with any specific next_section_keywords provided
-    all_end_keywords = [re.escape(kw.lower()) for kw in (common_end_keywords + next_section_keywords)]
-    end_pattern = r'(\n[ \t]*(' + '|'.join(all_end_keywords) + r')[ \t]*\n)' # Look for header followed by newline
-
-    section_text = text[start_index:]
-    end_match = re.search(end_pattern, section_text.lower())
-
-    if end_match:
-        end_index = end_match.start()
-        section_content = section_text[:end_index].strip()
-    else:
-        section_content = section_text.strip()
+    # Searched in place on the shared lower-cased copy; no per-call slices
+    end_match = _section_end_pattern(next_section_keywords).search(doc.lower, start_index)
+    section_content = doc.text[start_index:end_match.start() if end_match else len(doc.text)]
 
     return ' | '.join([line.strip() for line in section_content.split('\n') if line.strip()])
 
 
+# More robust section extraction using common headers and looking for patterns
+def extract_section(text, keywords, next_section_keywords=()):
+    return as_resume_text(text).section(keywords, next_section_keywords)
+
+
+# ==== EXPERIENCE TIMELINE ====
+# Date ranges ("Jun 2019 - Mar 2021", "06/2019 to present", "2018 – 2020") are
+# tokenized in one pass over the experience section into role spans. The spans
+# are merged so overlapping roles (a part-time job during a full-time one) are
+# only counted once.
+
+_MONTHS = {m: i for i, m in enumerate(("jan", "feb", "mar", "apr", "may", "jun",
+                                       "jul", "aug", "sep", "oct", "nov", "dec"))}
+
+
+class RoleSpan(namedtuple("RoleSpan", "title start end")):
+    """One role's dates as month indices (year * 12 + month - 1), both ends inclusive."""
+    __slots__ = ()
+
+    @property
+    def months(self):
+        return self.end - self.start + 1
+
+    def __str__(self):
+        label = f"{self.start // 12}-{self.start % 12 + 1:02d} to {self.end // 12}-{self.end % 12 + 1:02d}"
+        return f"{self.title} ({label})" if self.title else label
+
+
+def _month_index(match, prefix, end):
+    year = int(match.group(prefix + 'year'))
+    if match.group(prefix + 'mon'):
+        month = _MONTHS[match.group(prefix + 'mon')[:3].lower()]
+    elif match.group(prefix + 'num'):
+        month = int(match.group(prefix + 'num')) - 1
+    else:
+        month = 11 if end else 0  # a bare year covers the whole year
+    return year * 12 + month
+
+
+def _is_job_title(line):
+    # Typically capitalized, not too long and potentially followed by date ranges or location
+    return bool(PATTERNS['job_title'].search(line)) and len(line.split()) < 10 and line == line.title()
+
+
+def merge_spans(spans):
+    """Overlapping or back-to-back spans combined into (start, end) intervals."""
+    merged = []
+    for start, end in sorted((s.start, s.end) for s in spans):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def timeline_years(spans):
+    return sum(end - start + 1 for start, end in merge_spans(spans)) / 12
+
+
 def extract_experience_details(text):
+    """
+    (experience section, total years, unique job titles, role spans). Years
+    come from an explicit "N years of experience", else the merged timeline of
+    date ranges, else the sum of "N years / N months" mentions.
+    """
+    doc = as_resume_text(text)
     # Pass common section keywords as next_section_keywords to help bound the section
-    experience_section = extract_section(text, ["EXPERIENCE", "PROFESSIONAL EXPERIENCE", "WORK EXPERIENCE"],
+    experience_section = doc.section( ["EXPERIENCE", "PROFESSIONAL EXPERIENCE", "WORK EXPERIENCE"],
                                         next_section_keywords=["EDUCATION", "PROJECTS", "SKILLS"])
 
     if not experience_section:
-        return "", 0, "" # Return empty string, 0 years, empty roles if no experience section
+        return "", 0, [], [] # Return empty string, 0 years, no roles if no experience section
+
+    today = date.today()
+    now = today.year * 12 + today.month - 1
+    job_titles, spans = [], []
+    title = ""
+    # One pass over the lines: title lines set the current role, date ranges become its spans
+    for line in experience_section.split(' | '): # Split by the ' | ' delimiter used in extract_section
+        line = line.strip()
+        if _is_job_title(line):
+            title = PATTERNS['date_range'].sub('', line).strip(' ,|-–—') or line
+            if title not in job_titles:
+                job_titles.append(title)
+        for match in PATTERNS['date_range'].finditer(line):
+            start = _month_index(match, 's', False)
+            end = now if match.group('present') else _month_index(match, 'e', True)
+            if start <= min(end, now):
+                spans.append(RoleSpan(title, start, min(end, now)))
 
-    # Extract total years of experience
-    total_years = 0
     # Search for common phrases like "X years of experience"
-    years_match = re.search(r'(\d+(\.\d+)?)\s*years?\s*of\s*experience', text.lower())
+    years_match = PATTERNS['years_of_experience'].search(doc.text)
     if years_match:
         total_years = float(years_match.group(1))
+    elif spans:
+        total_years = timeline_years(spans)
     else:
-        # Attempt to sum up durations if explicit total years not found
-        durations = re.findall(r'(?:(\d+)\s*years?|(\d+)\s*months?)', experience_section.lower())
-        temp_years = 0
-        for year, month in durations:
+        # No dates to build a timeline from: sum up the stated durations
+        total_years = 0
+        for year, month in PATTERNS['duration'].findall(experience_section):
             if year:
-                temp_years += int(year)
+                total_years += int(year)
             if month:
-                temp_years += int(month) / 12
-        total_years = temp_years
+                total_years += int(month) / 12
 
-    # Extract job titles
-    # A simple approach: Look for lines that might be job titles (often bold, or followed by dates/company)
-    # This is a heuristic and may need refinement.
-    job_titles = []
-    lines = experience_section.split(' | ') # Split by the ' | ' delimiter used in extract_section
-    for line in lines:
-        # Look for common patterns of a job title: typically capitalized, not too long
-        # and potentially followed by date ranges or location
-        if re.search(r'\b(manager|engineer|developer|analyst|specialist|lead|architect|director)\b', line.lower()) and \
-           len(line.split()) < 10 and line.strip() == line.strip().title(): # Simple title case check
-            job_titles.append(line.strip())
+    return experience_section, round(total_years, 1), job_titles, spans
 
-    return experience_section, round(total_years, 1), ' | '.join(list(set(job_titles))) # Return unique titles
 
+# (minimum, points) pairs, highest first: the first tier the value reaches wins
+EDUCATION_GRADE_TIERS = [(90, 5), (80, 3), (70, 2), (0, 1)]  # grade normalized to 0-100
+JD_MATCH_TIERS = [(30, 15), (20, 10), (10, 5), (5, 3)]        # TF-IDF similarity x 100
 
-def extract_education(text):
-    section = extract_section(text, ["EDUCATION", "ACADEMIC BACKGROUND"],
-                                next_section_keywords=["EXPERIENCE", "SKILLS", "PROJECTS"])
-    score = 0
-    # Enhanced GPA/Percentage extraction (e.g., 9.5/10, 95%, 3.8/4.0)
-    gpa_match = re.search(r'(\d(?:\.\d{1,2})?)\s*(?:/|\s*out\s*of)\s*(?:10(?:\.0)?|4(?:\.0)?)', section)
-    percent_match = re.search(r'(\d{2,3}(?:\.\d{1,2})?)\s*%', section)
-    cgpa_match = re.search(r'CGPA[:\s]*(\d(?:\.\d{1,2})?)', section)
 
+def tier_points(value, tiers):
+    if value is None:
+        return 0
+    for minimum, points in tiers:
+        if value >= minimum:
+            return points
+    return 0
 
+
+def education_grade(section):
+    """GPA / percentage / CGPA in an education section, normalized to 0-100 (None if absent)."""
+    # Enhanced GPA/Percentage extraction (e.g., 9.5/10, 95%, 3.8/4.0)
+    gpa_match = PATTERNS['gpa'].search(section)
     if gpa_match:
         gpa_val = float(gpa_match.group(1))
         if '/10' in gpa_match.group(0): # If out of 10, normalize to 100
             gpa_val *= 10
         elif '/4' in gpa_match.group(0): # If out of 4, normalize to 100
             gpa_val *= 25
-        score = 5 if gpa_val >= 90 else 3 if gpa_val >= 80 else 2 if gpa_val >= 70 else 1
-    elif percent_match:
-        p = float(percent_match.group(1))
-        score = 5 if p >= 90 else 3 if p >= 80 else 2 if p >= 70 else 1
-    elif cgpa_match:
-        cgpa_val = float(cgpa_match.group(1))
+        return gpa_val
+    percent_match = PATTERNS['percent'].search(section)
+    if percent_match:
+        return float(percent_match.group(1))
+    cgpa_match = PATTERNS['cgpa'].search(section)
+    if cgpa_match:
         # Assuming typical Indian CGPA where max is 10
-        cgpa_val_normalized = cgpa_val * 10
-        score = 5 if cgpa_val_normalized >= 90 else 3 if cgpa_val_normalized >= 80 else 2 if cgpa_val_normalized >= 70 else 1
+        return float(cgpa_match.group(1)) * 10
+    return None
 
-    return section, score # No 'or 1' as discussed earlier
+
+def extract_education(text):
+    section = as_resume_text(text).section( ["EDUCATION", "ACADEMIC BACKGROUND"],
+                                next_section_keywords=["EXPERIENCE", "SKILLS", "PROJECTS"])
+    return section, tier_points(education_grade(section), EDUCATION_GRADE_TIERS)
 
 
 def extract_projects(text):
-    return extract_section(text, ["PROJECTS", "PROJECT EXPERIENCE", "ACADEMIC PROJECTS", "PERSONAL PROJECTS"],
+    return as_resume_text(text).section( ["PROJECTS", "PROJECT EXPERIENCE", "ACADEMIC PROJECTS", "PERSONAL PROJECTS"],
                            next_section_keywords=["SKILLS", "EXPERIENCE", "EDUCATION", "ACHIEVEMENTS"])
 
 # ==== SKILLS ====
 
-def extract_skills(text):
-    # Use spaCy for more dynamic skill extraction
-    doc = nlp(text.lower())
+# The skill taxonomy; app.candidates interns these first so their IDs are stable
+TECH_SKILLS = ("python", "java", "c++", "sql", "html", "css", "javascript", "react", "angular", "node.js",
+               "express.js", "django", "flask", "spring boot", "machine learning", "deep learning",
+               "tensorflow", "pytorch", "keras", "scikit-learn", "numpy", "pandas", "matplotlib", "seaborn",
+               "aws", "azure", "google cloud", "docker", "kubernetes", "git", "linux", "unix",
+               "rest api", "graphql", "mongodb", "postgresql", "mysql", "data science", "big data", "hadoop", "spark")
+
+SOFT_SKILLS = ("communication", "teamwork", "leadership", "problem solving", "adaptability",
+               "critical thinking", "creativity", "collaboration", "time management", "decision making",
+               "interpersonal skills", "presentation skills", "negotiation")
+
+# Each skill as a whole word; the plain substring test in extract_skills rules
+# out almost all of them before a regex runs
+_TECH_PATTERNS = [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in TECH_SKILLS]
+_SOFT_PATTERNS = [(skill, re.compile(r'\b' + re.escape(skill) + r'\b')) for skill in SOFT_SKILLS]
+
+def extract_skills(text, noun_chunks=True):
+    """Taxonomy skills by regex, plus spaCy noun-chunk mining unless noun_chunks=False."""
+    doc = as_resume_text(text)
     tech_skills = []
     soft_skills = []
 
-    # Predefined lists (can be expanded)
-    tech_keywords_base = ["python", "java", "c++", "sql", "html", "css", "javascript", "react", "angular", "node.js",
-                          "express.js", "django", "flask", "spring boot", "machine learning", "deep learning",
-                          "tensorflow", "pytorch", "keras", "scikit-learn", "numpy", "pandas", "matplotlib", "seaborn",
-                          "aws", "azure", "google cloud", "docker", "kubernetes", "git", "linux", "unix",
-                          "rest api", "graphql", "mongodb", "postgresql", "mysql", "data science", "big data", "hadoop", "spark"]
-
-    soft_keywords_base = ["communication", "teamwork", "leadership", "problem solving", "adaptability",
-                          "critical thinking", "creativity", "collaboration", "time management", "decision making",
-                          "interpersonal skills", "presentation skills", "negotiation"]
-
-    # Combine text from skill-like sections
-    skills_section = extract_section(text, ["SKILLS", "TECHNICAL SKILLS", "PROGRAMMING LANGUAGES", "TOOLS", "TECHNOLOGIES", "COMPETENCIES"])
-    text_to_analyze = (text + " " + skills_section).lower()
-
-    # Regex for finding skills: exact word match or common tech phrases
-    for skill in tech_keywords_base:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_to_analyze):
+    # Matched on the whole text only: the skills section is part of it, so
+    # appending another copy of the section (as this used to) finds nothing new
+    for skill, pattern in _TECH_PATTERNS:
+        if skill in doc.lower and pattern.search(doc.lower):
             tech_skills.append(skill.capitalize()) # Capitalize for consistency
 
     # Look for common soft skill indicators
-    for skill in soft_keywords_base:
-        if re.search(r'\b' + re.escape(skill) + r'\b', text_to_analyze):
+    for skill, pattern in _SOFT_PATTERNS:
+        if skill in doc.lower and pattern.search(doc.lower):
             soft_skills.append(skill.capitalize())
 
+    if not noun_chunks:
+        return sorted(set(tech_skills)), sorted(set(soft_skills))
+
+    # Use spaCy for more dynamic skill extraction
+    nlp_doc = nlp(doc.lower)
     # Further extraction using noun chunks for potential skills (less precise but more dynamic)
     # This might pick up more noise but also more unlisted skills.
     # Consider adjusting based on desired precision/recall.
-    for chunk in doc.noun_chunks:
+    for chunk in nlp_doc.noun_chunks:
         chunk_text = chunk.text.lower()
         # Add a heuristic to only consider longer, more specific noun chunks as potential skills
-        if len(chunk_text.split()) < 4 and len(chunk_text) > 3 and not re.search(r'\d', chunk_text):
-            if any(tech_kw in chunk_text for tech_kw in tech_keywords_base) and chunk_text not in [s.lower() for s in tech_skills]:
+        if len(chunk_text.split()) < 4 and len(chunk_text) > 3 and not PATTERNS['digit'].search(chunk_text):
+            if any(tech_kw in chunk_text for tech_kw in TECH_SKILLS) and chunk_text not in [s.lower() for s in tech_skills]:
                 tech_skills.append(chunk_text.capitalize())
-            elif any(soft_kw in chunk_text for soft_kw in soft_keywords_base) and chunk_text not in [s.lower() for s in soft_skills]:
+            elif any(soft_kw in chunk_text for soft_kw in SOFT_SKILLS) and chunk_text not in [s.lower() for s in soft_skills]:
                 soft_skills.append(chunk_text.capitalize())
 
     # Remove duplicates and ensure clean list
@@ -251,15 +649,4 @@ def compute_tfidf_match(resume_text, jd_text):
     tfidf_matrix = vectorizer.fit_transform([resume_text, jd_text])
     score = (tfidf_matrix[0] @ tfidf_matrix[1].T).toarray()[0][0] * 100
 
-    # More granular JD points based on score
-    if score >= 30: # Increased threshold for higher points
-        jd_points = 15
-    elif score >= 20:
-        jd_points = 10
-    elif score >= 10:
-        jd_points = 5
-    elif score >= 5:
-        jd_points = 3
-    else:
-        jd_points = 0
-    return score, jd_points
\ No newline at end of file
+    return score, tier_points(score, JD_MATCH_TIERS)
@@ -0,0 +1,319 @@
+# app/watcher.py
+# Long-running ingestion service: watches a resume folder and parses new or
+# changed files as they arrive, keeping the output CSV up to date.
+import json
+import os
+import queue
+import threading
+import time
+import pandas as pd
+
+from app.parser import parse_resume_text
+from app.utils import extract_text, scan_contact_info
+from app.dedupe import contact_keys
+from app.scoring import ProfileLoader
+from app.stats import BatchStats
+
+RESUME_EXTENSIONS = ('.pdf', '.docx')
+
+
+class ResumeWatcher:
+    """
+    Polls `folder` every `interval` seconds and feeds new/changed resumes through a
+    bounded work queue to `workers` parser threads. Results are merged into
+    `output_file` once per poll, and the file signatures already
+    processed are kept in `<output_file>.state.json` so a restart only picks up
+    what changed while the service was down.
+    """
+
+    def __init__(self, folder, jd_text, output_file, workers=2, queue_size=100, interval=2.0, profile=None):
+        self.folder = folder
+        self.jd_text = jd_text
+        self.output_file = output_file
+        self.state_file = output_file + ".state.json"
+        self.metrics_file = output_file + ".metrics.json"
+        self.interval = interval
+        self.workers = workers
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+
+        self.records = {}     # filename -> parsed row
+        self.processed = {}   # filename -> [mtime_ns, size] of the parsed version
+        self.pending = {}     # filename -> time it was queued
+        self.candidates = {}  # email/phone key -> filename holding that candidate
+        self.keys = {}        # filename -> the contact keys it holds
+        self.duplicates = {}  # filename -> other files from the same candidate
+        self.duplicate_of = {}  # duplicate filename -> filename holding its candidate
+        self._last_seen = {}  # filename -> signature from the previous poll
+        self.stats = BatchStats()  # over the current records
+        self.profile = ProfileLoader(profile)  # reloaded when the file changes
+        self.profile_version = self.profile.version
+
+        self.parsed_count = 0
+        self.failed_count = 0
+        self.last_lag = 0.0   # seconds from enqueue to finished, for the last resume
+        self.dirty = False    # output needs rewriting on the next poll
+
+        out_dir = os.path.dirname(output_file)
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+        self._load()
+
+    # ==== STATE ====
+
+    def _load(self):
+        if os.path.exists(self.state_file):
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                self.processed = json.load(f)
+        if os.path.exists(self.output_file):
+            df = pd.read_csv(self.output_file).fillna("")
+            for row in df.to_dict("records"):
+                self.records[row["Filename"]] = row
+                self.stats.add(row)
+                self.duplicates[row["Filename"]] = [f for f in str(row.get("DuplicateFiles", "")).split(", ") if f]
+                for duplicate in self.duplicates[row["Filename"]]:
+                    self.duplicate_of[duplicate] = row["Filename"]
+                keys = contact_keys(row.get("Email", ""), str(row.get("Phone", "")))
+                self.keys[row["Filename"]] = [k for k in keys if self.candidates.setdefault(k, row["Filename"]) == row["Filename"]]
+
+    def _save(self):
+        # Write to a temp file and rename so readers never see a half-written CSV
+        tmp_path = self.output_file + ".tmp"
+        pd.DataFrame(list(self.records.values())).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.output_file)
+        with open(self.state_file + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self.processed, f)
+        os.replace(self.state_file + ".tmp", self.state_file)
+
+    # ==== METRICS ====
+
+    def metrics(self):
+        now = time.time()
+        with self.lock:
+            oldest = min(self.pending.values()) if self.pending else None
+            return {
+                "queue_depth": self.queue.qsize(),
+                "in_flight": len(self.pending) - self.queue.qsize(),
+                "parsed": self.parsed_count,
+                "failed": self.failed_count,
+                "candidates": len(self.records),
+                # How long the oldest unfinished resume has been waiting
+                "processing_lag_seconds": round(now - oldest, 2) if oldest else 0.0,
+                "last_resume_latency_seconds": round(self.last_lag, 2),
+                "status_counts": dict(self.stats.status_counts),
+                "suggested_thresholds": self.stats.suggest_thresholds(),
+            }
+
+    def flush(self):
+        """Rewrite the output once per poll instead of once per resume."""
+        with self.lock:
+            if self.dirty:
+                self._save()
+                self.dirty = False
+
+    def _write_metrics(self):
+        with open(self.metrics_file, "w", encoding="utf-8") as f:
+            json.dump(self.metrics(), f)
+
+    # ==== POLLING ====
+
+    def scan(self):
+        """Queue every resume that is new or changed since it was last parsed."""
+        current = {}
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.name.lower().endswith(RESUME_EXTENSIONS):
+                    info = entry.stat()
+                    current[entry.name] = [info.st_mtime_ns, info.st_size]
+
+        for filename, signature in current.items():
+            # Only pick a file up once it has stopped changing between two polls,
+            # so half-copied uploads are not parsed
+            if self._last_seen.get(filename) != signature:
+                continue
+            if self.processed.get(filename) == signature or filename in self.pending:
+                continue
+            try:
+                self.queue.put_nowait((filename, signature))
+            except queue.Full:
+                break  # backpressure: the rest will be picked up on a later poll
+            with self.lock:
+                self.pending[filename] = time.time()
+
+        # Files removed from the folder drop out of the report
+        removed = [f for f in self.processed if f not in current]
+        if removed:
+            with self.lock:
+                for filename in removed:
+                    self.processed.pop(filename, None)
+                    self._release(filename)
+                self.dirty = True
+
+        self._last_seen = current
+
+    def rescore_if_profile_changed(self):
+        """After a profile reload, re-score every current record from its parsed fields."""
+        scorer = self.profile.current()
+        if self.profile.version == self.profile_version:
+            return
+        with self.lock:
+            self.profile_version = self.profile.version
+            self.records = {f: scorer.rescore(r) for f, r in self.records.items()}
+            self.stats = BatchStats.from_records(self.records.values())
+            self.dirty = True
+        print(f"Re-scored {len(self.records)} candidates with profile '{scorer.name}'")
+
+    # ==== CANDIDATES ====
+    # Each candidate is held by one file (its record, its email/phone keys);
+    # later files from the same candidate are only listed as its duplicates.
+    # Both helpers expect the lock to be held.
+
+    def _detach(self, filename):
+        """Take `filename` off the duplicate list of the file holding its candidate."""
+        holder = self.duplicate_of.pop(filename, None)
+        if holder is None:
+            return
+        duplicates = self.duplicates.get(holder, [])
+        if filename in duplicates:
+            duplicates.remove(filename)
+        if holder in self.records:
+            self.records[holder]["DuplicateFiles"] = ", ".join(duplicates)
+
+    def _release(self, filename):
+        """
+        Forget `filename` as a candidate (removed, emptied, or now a duplicate of
+        someone else). Its record and contact keys go, and the files listed as
+        its duplicates are parsed again on the next poll, so one of them takes
+        the candidate over.
+        """
+        if filename in self.records:
+            self.stats.remove(self.records.pop(filename))
+        for key in self.keys.pop(filename, []):
+            if self.candidates.get(key) == filename:
+                del self.candidates[key]
+        for duplicate in self.duplicates.pop(filename, []):
+            self.duplicate_of.pop(duplicate, None)
+            self.processed.pop(duplicate, None)
+        self._detach(filename)
+        self.dirty = True
+
+    # ==== WORKERS ====
+
+    def _process(self, filename, signature):
+        text = extract_text(os.path.join(self.folder, filename))
+        if not text.strip():
+            print(f"Skipping empty or unreadable resume: {filename}")
+            with self.lock:
+                self._release(filename)
+                self.processed[filename] = signature
+                self.dirty = True
+            return
+
+        keys = contact_keys(*scan_contact_info(text)[:2])
+        with self.lock:
+            existing = next((self.candidates[k] for k in keys
+                             if self.candidates.get(k, filename) != filename), None)
+            if existing:
+                # Same candidate applied again: note it instead of parsing twice
+                if self.duplicate_of.get(filename) != existing:
+                    self._release(filename)  # it held a candidate itself, or was another one's copy
+                    duplicates = self.duplicates.setdefault(existing, [])
+                    duplicates.append(filename)
+                    self.duplicate_of[filename] = existing
+                    if existing in self.records:
+                        self.records[existing]["DuplicateFiles"] = ", ".join(duplicates)
+                self.processed[filename] = signature
+                self.dirty = True
+                return
+            # A changed copy whose contact details no longer match is its own candidate now
+            self._detach(filename)
+            # Claim the candidate before parsing so a copy picked up by another
+            # worker meanwhile is recognised as a duplicate
+            held = self.keys.get(filename, [])
+            claimed = [k for k in keys if k not in held and self.candidates.setdefault(k, filename) == filename]
+
+        try:
+            record = parse_resume_text(filename, text, self.jd_text, self.profile.current())
+        except Exception:
+            with self.lock:
+                for key in claimed:
+                    if self.candidates.get(key) == filename:
+                        del self.candidates[key]
+            raise
+        with self.lock:
+            # Keys the previous version had but this one does not are free again,
+            # and its duplicates are checked again against the new details
+            if any(key not in keys for key in held):
+                for key in held:
+                    if key not in keys and self.candidates.get(key) == filename:
+                        del self.candidates[key]
+                for duplicate in self.duplicates.pop(filename, []):
+                    self.duplicate_of.pop(duplicate, None)
+                    self.processed.pop(duplicate, None)
+            self.keys[filename] = keys
+            record["DuplicateFiles"] = ", ".join(self.duplicates.get(filename, []))
+            if filename in self.records:
+                self.stats.remove(self.records[filename])  # changed file, re-parsed
+            self.records[filename] = record
+            self.stats.add(record)
+            self.processed[filename] = signature
+            self.dirty = True
+        print(f"Parsed {filename}: {record['Status']} ({record['Final_Score']})")
+
+    def _worker(self):
+        while not self.stop_event.is_set():
+            try:
+                filename, signature = self.queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            try:
+                self._process(filename, signature)
+                with self.lock:
+                    self.parsed_count += 1
+            except Exception as e:
+                print(f"Error parsing {filename}: {e}")
+                with self.lock:
+                    self.failed_count += 1
+                    # Remember the failed version so it is not retried until it changes
+                    self.processed[filename] = signature
+                    self.dirty = True
+            finally:
+                with self.lock:
+                    queued_at = self.pending.pop(filename, None)
+                    if queued_at:
+                        self.last_lag = time.time() - queued_at
+                self.queue.task_done()
+
+    # ==== LIFECYCLE ====
+
+    def run(self, status_every=30.0):
+        """Run until stop() is called or the process is interrupted."""
+        threads = [threading.Thread(target=self._worker, daemon=True) for _ in range(self.workers)]
+        for t in threads:
+            t.start()
+        print(f"Watching '{self.folder}' -> '{self.output_file}' with {self.workers} workers")
+
+        last_status = 0.0
+        try:
+            while not self.stop_event.is_set():
+                self.rescore_if_profile_changed()
+                self.scan()
+                self.flush()
+                self._write_metrics()
+                if time.time() - last_status >= status_every:
+                    print(f"Status: {self.metrics()}")
+                    last_status = time.time()
+                self.stop_event.wait(self.interval)
+        except KeyboardInterrupt:
+            print("Stopping watcher...")
+        finally:
+            self.stop_event.set()
+            for t in threads:
+                t.join()
+            self.flush()
+            self._write_metrics()
+
+    def stop(self):
+        self.stop_event.set()
@@ -1,4 +1,4 @@
-from app.emailer import process_csv_and_send_emails
+from app.cli import main
 
 if __name__ == "__main__":
-    process_csv_and_send_emails("outputs/parsed_resumes.csv")
+    main(["email", "--input", "outputs/parsed_resumes.csv"])
@@ -1,9 +1,33 @@
 import streamlit as st
+import multiprocessing
 import os
 import pandas as pd
-from app.parser import parse_resumes_with_jd
-from app.utils import extract_text_from_pdf, extract_text_from_docx
-from app.emailer import send_email
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from app.jobs import ParseJob, EmailJob
+from app.ocr import OCRStage, ocr_available
+from app.parser import DEFAULT_TIER, TIERS
+from app.results import ResultsView
+from app.utils import load_jd_text
+
+PARSE_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+EMAIL_WORKERS = 4
+PAGE_SIZE = 50  # result rows sent to the browser per page
+OCR_WORKERS = 1  # OCR is slow and CPU-heavy; keep it from crowding out parsing
+
+
+# Pools are shared by all sessions and survive reruns; each session only holds its own jobs
+@st.cache_resource
+def get_parse_pool():
+    # spawn (not fork) because the Streamlit server process is multi-threaded
+    return ProcessPoolExecutor(max_workers=PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+@st.cache_resource
+def get_email_pool():
+    return ThreadPoolExecutor(max_workers=EMAIL_WORKERS)
+
+@st.cache_resource
+def get_ocr_pool():
+    return ProcessPoolExecutor(max_workers=OCR_WORKERS, mp_context=multiprocessing.get_context("spawn"))
 
 
 st.set_page_config(page_title="Resume Parser", layout="wide")
@@ -16,73 +40,133 @@ jd_file = st.file_uploader("📥 Upload Job Description File (TXT / PDF / DOCX)"
 # === Upload Resumes ===
 resumes = st.file_uploader("📥 Upload Resumes (PDF/DOCX)", type=["pdf", "docx"], accept_multiple_files=True)
 
+use_ocr = ocr_available() and st.checkbox("🔍 OCR scanned PDFs (slower)", value=False)
+tier = st.selectbox("⚙️ Parsing depth", list(TIERS), index=list(TIERS).index(DEFAULT_TIER),
+                    help="fast: regex and keywords only; balanced: adds name detection; thorough: full NLP")
+escalate = tier != "thorough" and st.checkbox("Re-parse borderline candidates at 'thorough'", value=True)
+
+parse_job = st.session_state.get('parse_job')
+parse_running = parse_job is not None and parse_job.running
+
 if jd_file and resumes:
-    if st.button("🚀 Parse Resumes"):
-        os.makedirs("tmp", exist_ok=True)
+    if st.button("🚀 Parse Resumes", disabled=parse_running):
+        # Everything is parsed straight from the uploads held in memory; nothing is
+        # written to a shared tmp/ folder, so sessions can't see each other's files.
 
         # === Process JD file ===
-        jd_ext = jd_file.name.split(".")[-1].lower()
-        jd_text = ""
-
-        jd_path = os.path.join("tmp", f"jd_tmp.{jd_ext}")
-        with open(jd_path, "wb") as f:
-            f.write(jd_file.read())
-
-        # Extract JD text based on file type
-        if jd_ext == "pdf":
-            jd_text = extract_text_from_pdf(jd_path)
-        elif jd_ext == "docx":
-            jd_text = extract_text_from_docx(jd_path)
-        elif jd_ext == "txt":
-            with open(jd_path, "r", encoding="utf-8", errors="ignore") as f:
-                jd_text = f.read()
-        else:
+        try:
+            jd_text = load_jd_text(jd_file.getvalue(), jd_file.name)
+        except ValueError:
             st.error("Unsupported JD file type.")
             st.stop()
 
-        # === Save Resumes ===
-        resume_folder = "tmp/resumes"
-        os.makedirs(resume_folder, exist_ok=True)
+        # === Run Parser in the background ===
+        uploads = [(resume.name, resume.getvalue()) for resume in resumes]
+        ocr = OCRStage(OCR_WORKERS, pool=get_ocr_pool()) if use_ocr else None
+        parse_job = ParseJob(uploads, jd_text, get_parse_pool(), PARSE_WORKERS, ocr=ocr,
+                             tier=tier, escalate=escalate).start()
+        st.session_state['parse_job'] = parse_job
+        for key in ('parsed_df', 'results_view', 'export_key', 'email_job'):
+            st.session_state.pop(key, None)
 
-        for resume in resumes:
-            resume_path = os.path.join(resume_folder, resume.name)
-            with open(resume_path, "wb") as f:
-                f.write(resume.read())
 
-        # === Run Parser ===
-        output_file = "tmp/parsed_resumes.csv"
-        df = parse_resumes_with_jd(resume_folder, jd_text, output_file)
+# === Parsing progress ===
+@st.fragment(run_every=1.0)
+def show_parse_progress():
+    job = st.session_state.get('parse_job')
+    if job is None or 'parsed_df' in st.session_state:
+        return
+
+    st.progress(job.progress, text=f"{job.stage.capitalize()}: {job.done}/{job.total} files")
+    for level, message in job.messages:
+        getattr(st, level)(message)
+
+    if job.running:
+        if st.button("⏹️ Cancel Parsing"):
+            job.cancel()
+        if job.results:
+            st.caption(f"Partial results ({len(job.results)} parsed so far, latest shown)")
+            st.dataframe(pd.DataFrame(job.results[-20:])[["Filename", "Name", "Email", "Status", "Final_Score"]])
+        return
+
+    # Finished (or cancelled): keep whatever was parsed and redraw the full page
+    st.session_state['parsed_df'] = pd.DataFrame(job.results)
+    st.session_state['results_view'] = ResultsView(st.session_state['parsed_df'])
+    st.rerun()
+
+show_parse_progress()
 
-        st.session_state['parsed_df'] = df
-        st.success("✅ Parsing Complete!")
 
 # === Display Results ===
 if 'parsed_df' in st.session_state:
     df = st.session_state['parsed_df']
+    if parse_job is not None and parse_job.stage == "cancelled":
+        st.warning(f"Parsing was cancelled; showing the {len(df)} resumes parsed before that.")
+    else:
+        st.success("✅ Parsing Complete!")
 
-    st.dataframe(df)
-    st.download_button(
-        label="⬇️ Download Results as CSV", # Using a simpler down arrow emoji
-        data=df.to_csv(index=False).encode('utf-8'),
-        file_name="parsed_resumes.csv",
-        mime="text/csv"
-    )
+    # Filtering and paging run here on the server; only one page goes to the browser
+    view = st.session_state['results_view']
+    status_col, score_col, skill_col = st.columns(3)
+    statuses = status_col.multiselect("Status", view.statuses())
+    low, high = view.score_range()
+    score_range = score_col.slider("Score", low, high, (low, high)) if high > low else None
+    skills = skill_col.multiselect("Has all of these skills", view.skills())
+    rows = view.select(statuses, score_range, skills)
+
+    pages = max(1, -(-len(rows) // PAGE_SIZE))
+    page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1) - 1
+    st.caption(f"{len(rows)} of {len(view)} candidates match")
+    st.dataframe(view.page(rows, page, PAGE_SIZE), hide_index=True)
+
+    # Long text sections only for the candidate asked about
+    with st.expander("🔎 Candidate details"):
+        page_rows = rows[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+        picked = st.selectbox("Candidate", page_rows,
+                              format_func=lambda r: f"{view.df.at[r, 'Name']} ({view.df.at[r, 'Filename']})")
+        if picked is not None:
+            for field, value in view.details(picked).items():
+                st.markdown(f"**{field}**")
+                st.text(value)
+
+    # The CSV is only encoded when asked for, and reused until the filters change
+    export_key = (tuple(statuses), score_range, tuple(skills))
+    if st.button("📦 Prepare CSV of these candidates"):
+        st.session_state['export_key'] = export_key
+    if st.session_state.get('export_key') == export_key:
+        st.download_button(
+            label="⬇️ Download Results as CSV", # Using a simpler down arrow emoji
+            data=view.export_csv(rows, export_key),
+            file_name="parsed_resumes.csv",
+            mime="text/csv"
+        )
 
 
     # === Send Emails ===
     if "Email" in df.columns and "Status" in df.columns:
         st.subheader("Send Emails to Candidates")
-        if st.button("Send Emails Now"):
-            sent = 0
-            for _, row in df.iterrows():
-                name = row.get("Name", "Candidate")
-                email = row.get("Email", "")
-                status = str(row.get("Status", "")).strip()
-
-                if status in ["Shortlisted", "Rejected"] and email:
-                    success = send_email(email, name, status)
-                    if success:
-                        sent += 1
-            st.success(f"Emails sent to {sent} candidates.")
+        email_job = st.session_state.get('email_job')
+        if st.button("Send Emails Now", disabled=email_job is not None and email_job.running):
+            # One email per candidate, even if they applied twice; messages are
+            # all rendered before sending starts
+            st.session_state['email_job'] = EmailJob(df.to_dict("records"), get_email_pool(), EMAIL_WORKERS).start()
+
+        @st.fragment(run_every=1.0)
+        def show_email_progress():
+            job = st.session_state.get('email_job')
+            if job is None:
+                return
+            st.progress(job.progress, text=f"{job.stage.capitalize()}: {job.done}/{job.total} emails")
+            if job.running:
+                if st.button("⏹️ Cancel Sending"):
+                    job.cancel()
+            elif job.stage == "cancelled":
+                st.warning(f"Sending cancelled after {len(job.results)} emails.")
+            else:
+                st.success(f"Emails sent to {len(job.results)} candidates.")
+            if job.failed:
+                st.error(f"Failed for {len(job.failed)} candidates: {', '.join(job.failed)}")
+
+        show_email_progress()
     else:
         st.warning("'Email' or 'Status' column not found in parsed data.")